@@ -0,0 +1,276 @@
+import heapq
+import time
+from collections import deque
+from core.grid import SNAKE, EGG, SPIKES, BLOCK
+from core.simulation import CELL, UP, DOWN, LEFT, RIGHT
+
+INF = 1 << 30
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+
+
+class DistanceField:
+    # multi-source BFS distance to the nearest egg, patched as cells open, close and eggs come and go
+    def __init__(self, cols, rows):
+        self.cols = cols
+        self.rows = rows
+        size = cols * rows
+        self.walls = bytes(
+            1 if not (1 <= i % cols < cols - 1 and 1 <= i // cols < rows - 1) else 0 for i in range(size)
+        )
+        self.neighbors = [
+            tuple(j for j in (i - cols, i + cols, i - 1, i + 1) if 0 <= j < size and not self.walls[j])
+            for i in range(size)
+        ]
+        self.dist = [INF] * size
+        self.blocked = bytearray(self.walls)
+        self.sources = set()
+        # cells touched by patches since the last rebuild, for the stats
+        self.touched = 0
+        # past this many invalidated cells a patch costs more than refilling the whole field
+        self.patch_limit = size // 16
+        # set when a patch gave up, the caller refills once all changes are in
+        self.stale = False
+
+    def rebuild(self, blocked, sources):
+        self.blocked = bytearray(self.walls)
+        for i in blocked:
+            self.blocked[i] = 1
+        self.sources = set(sources)
+        self.refill()
+
+    def refill(self):
+        self.stale = False
+        self.dist = [INF] * len(self.dist)
+        queue = deque()
+        for i in self.sources:
+            if not self.blocked[i]:
+                self.dist[i] = 0
+                queue.append(i)
+        dist = self.dist
+        blocked = self.blocked
+        neighbors = self.neighbors
+        while queue:
+            u = queue.popleft()
+            d = dist[u] + 1
+            for v in neighbors[u]:
+                if d < dist[v] and not blocked[v]:
+                    dist[v] = d
+                    queue.append(v)
+
+    def update(self, i, blocked, source):
+        was_blocked = self.blocked[i]
+        was_source = i in self.sources
+        if bool(was_blocked) == blocked and was_source == source:
+            return
+        self.blocked[i] = 1 if blocked else 0
+        if source:
+            self.sources.add(i)
+        else:
+            self.sources.discard(i)
+        if self.stale:
+            return
+        if was_source and not source:
+            # every cell that was closest to this egg has to find another one, that is a region, not a patch
+            self.stale = True
+            return
+        if blocked and not was_blocked:
+            self.invalidate(i)
+        if not blocked:
+            self.lower(i)
+
+    def invalidate(self, start):
+        # every cell whose distance only came through start, then refill them from the cells around
+        dist = self.dist
+        blocked = self.blocked
+        neighbors = self.neighbors
+        affected = {start}
+        queue = deque([start])
+        while queue:
+            u = queue.popleft()
+            d = dist[u]
+            if d >= INF:
+                continue
+            for v in neighbors[u]:
+                if v in affected or blocked[v] or dist[v] != d + 1:
+                    continue
+                # v keeps its distance while another neighbour still supports it
+                if any(dist[w] == d and w not in affected and not blocked[w] for w in neighbors[v]):
+                    continue
+                affected.add(v)
+                if len(affected) > self.patch_limit:
+                    self.stale = True
+                    return
+                queue.append(v)
+
+        for v in affected:
+            dist[v] = INF
+        heap = []
+        for v in affected:
+            if blocked[v]:
+                continue
+            if v in self.sources:
+                d = 0
+            else:
+                d = min((dist[w] for w in neighbors[v] if not blocked[w]), default=INF) + 1
+            if d < INF:
+                dist[v] = d
+                heap.append((d, v))
+        heapq.heapify(heap)
+        self.touched += len(affected)
+        self.propagate(heap)
+
+    def lower(self, i):
+        if i in self.sources:
+            d = 0
+        else:
+            d = min((self.dist[w] for w in self.neighbors[i] if not self.blocked[w]), default=INF) + 1
+        if d < self.dist[i]:
+            self.dist[i] = d
+            self.propagate([(d, i)])
+
+    def propagate(self, heap):
+        dist = self.dist
+        blocked = self.blocked
+        neighbors = self.neighbors
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d != dist[u]:
+                continue
+            self.touched += 1
+            for v in neighbors[u]:
+                if d + 1 < dist[v] and not blocked[v]:
+                    dist[v] = d + 1
+                    heapq.heappush(heap, (d + 1, v))
+
+    def space(self, start, limit):
+        # free cells reachable from start, counting stops at limit
+        blocked = self.blocked
+        neighbors = self.neighbors
+        seen = {start}
+        queue = deque([start])
+        while queue and len(seen) < limit:
+            for v in neighbors[queue.popleft()]:
+                if v not in seen and not blocked[v]:
+                    seen.add(v)
+                    queue.append(v)
+        return len(seen)
+
+
+class Autopilot:
+    # shortest path to the nearest egg, falling back to the move with the most room when that path is a trap
+    def __init__(self, sim=None, window=300):
+        self.sim = None
+        self.field = None
+        self.timings = deque(maxlen=window)
+        self.decisions = 0
+        self.fallbacks = 0
+        self.rebuilds = 0
+        if sim is not None:
+            self.attach(sim)
+
+    def attach(self, sim):
+        self.sim = sim
+        self.cols = sim.width // CELL
+        self.field = DistanceField(self.cols, sim.height // CELL)
+        self.ticks = None
+
+    def index(self, pos):
+        return (pos[1] // CELL) * self.cols + pos[0] // CELL
+
+    def rebuild(self):
+        sim = self.sim
+        self.rebuilds += 1
+        self.layout_version = sim.layout_version
+        self.blocks = {block['pos'] for block in sim.moving_blocks}
+        self.eggs = set(sim.egg_positions)
+        blocked = [self.index(pos) for pos in sim.snake]
+        blocked += [self.index(pos) for pos in sim.obstacles]
+        blocked += [self.index(pos) for pos in self.blocks]
+        self.field.rebuild(blocked, [self.index(pos) for pos in self.eggs])
+
+    def sync(self):
+        # called once per move, so only the head, the old tail, blocks and eggs can have changed
+        sim = self.sim
+        if (self.ticks is None or sim.ticks != self.ticks + 1 or
+                sim.layout_version != self.layout_version or
+                len(sim.snake) > 1 and sim.snake[1] != self.head):
+            self.rebuild()
+        else:
+            blocks = {block['pos'] for block in sim.moving_blocks}
+            eggs = set(sim.egg_positions)
+            changed = {sim.snake[0], self.tail}
+            changed.update(blocks ^ self.blocks)
+            changed.update(eggs ^ self.eggs)
+            self.blocks = blocks
+            self.eggs = eggs
+            for pos in changed:
+                flags = sim.grid.has(pos, SNAKE | EGG | SPIKES | BLOCK)
+                self.field.update(self.index(pos), bool(flags & (SNAKE | SPIKES | BLOCK)), bool(flags & EGG))
+            if self.field.stale:
+                self.rebuilds += 1
+                self.field.refill()
+        self.ticks = sim.ticks
+        self.head = sim.snake[0]
+        self.tail = sim.snake[-1]
+
+    def choose(self, sim):
+        start = time.perf_counter()
+        if sim is not self.sim:
+            self.attach(sim)
+        self.sync()
+        field = self.field
+        head = sim.snake[0]
+        current = sim.direction_queue[-1] if sim.direction_queue else sim.direction
+        # cells a moving block steps into before the snake gets there, when deciding ahead of time
+        move_time = max(sim.time, sim.last_move_time + sim.move_interval)
+        danger = {
+            (block['pos'][0] + block['direction'][0], block['pos'][1] + block['direction'][1])
+            for block in sim.moving_blocks
+            if block['last_move'] + block['move_interval'] <= move_time
+        }
+        options = []
+        risky = []
+        for direction in DIRECTIONS:
+            if direction[0] == -current[0] and direction[1] == -current[1]:
+                continue
+            pos = (head[0] + direction[0], head[1] + direction[1])
+            i = self.index(pos)
+            if not field.blocked[i]:
+                (risky if pos in danger else options).append((field.dist[i], direction, i))
+        options = options or risky
+
+        choice = None
+        if options:
+            options.sort()
+            distance, direction, i = options[0]
+            need = len(sim.snake) + 1
+            if distance < INF and field.space(i, need) >= need:
+                choice = direction
+            else:
+                # no safe path to an egg: take the most room, then stay close to the tail as it frees cells
+                self.fallbacks += 1
+                tail = sim.snake[-1]
+                limit = 4 * need + 50
+                choice = max(options, key=lambda o: (
+                    field.space(o[2], limit),
+                    -abs(head[0] + o[1][0] - tail[0]) - abs(head[1] + o[1][1] - tail[1])
+                ))[1]
+
+        self.decisions += 1
+        self.timings.append((time.perf_counter() - start) * 1000)
+        return None if choice is None or choice == current else choice
+
+    __call__ = choose
+
+    def stats(self):
+        if not self.timings:
+            return {}
+        ordered = sorted(self.timings)
+        return {
+            "decisions": self.decisions,
+            "fallbacks": self.fallbacks,
+            "rebuilds": self.rebuilds,
+            "mean_ms": sum(ordered) / len(ordered),
+            "p99_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))],
+            "max_ms": ordered[-1]
+        }
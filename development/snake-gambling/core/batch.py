@@ -0,0 +1,274 @@
+import sys
+import time
+import numpy as np
+from core.grid import SNAKE, EGG, SPIKES, BLOCK
+from core.simulation import CELL, DEFAULT_UPGRADES
+
+# action codes, same order as the replay log: up, down, left, right, -1 keeps going
+DX = np.array([0, 0, -1, 1])
+DY = np.array([-1, 1, 0, 0])
+OPPOSITE = np.array([1, 0, 3, 2])
+NO_ACTION = -1
+
+MAX_EGGS = 5
+SPIKE_COUNT = 10
+MAX_BLOCKS = 64
+MOVE_INTERVAL = 100
+BLOCK_MOVE_INTERVAL = 1000
+
+
+class BatchSimulation:
+    # n independent boards with the Simulation rules, stepped one snake move at a time with array ops
+    def __init__(self, boards, width=1260, height=720, upgrades=None, seed=None):
+        self.boards = boards
+        self.width = width
+        self.height = height
+        self.cols = width // CELL
+        self.rows = height // CELL
+        self.cells = self.cols * self.rows
+        self.rng = np.random.default_rng(seed)
+        # levels can be plain numbers or one value per board, to compare balance changes side by side
+        upgrades = upgrades if upgrades is not None else DEFAULT_UPGRADES
+        self.upgrades = {name: np.broadcast_to(np.asarray(value), (boards,)).copy()
+                         for name, value in upgrades.items()}
+
+        # spawn cells, the same region Simulation's free cell sampler covers
+        xs, ys = np.meshgrid(np.arange(1, self.cols - 2), np.arange(1, self.rows - 2))
+        self.spawn_cells = (ys * self.cols + xs).ravel()
+        # moving block lanes: top, right, bottom, left, padded to one width
+        lanes = [
+            [1 * self.cols + x for x in range(1, self.cols - 2)],
+            [y * self.cols + self.cols - 2 for y in range(1, self.rows - 2)],
+            [(self.rows - 2) * self.cols + x for x in range(1, self.cols - 2)],
+            [y * self.cols + 1 for y in range(1, self.rows - 2)]
+        ]
+        self.lane_lengths = np.array([len(lane) for lane in lanes])
+        self.lanes = np.zeros((4, self.lane_lengths.max()), dtype=np.int64)
+        for side, lane in enumerate(lanes):
+            self.lanes[side, :len(lane)] = lane
+        self.lane_directions = np.array([1, 2, 0, 3])
+        self.start_cell = ((height // 2) // CELL) * self.cols + (width // 2) // CELL
+
+        n = boards
+        self.grid = np.zeros((n, self.cells), dtype=np.uint8)
+        self.body = np.zeros((n, self.cells), dtype=np.int64)
+        self.head_index = np.zeros(n, dtype=np.int64)
+        self.length = np.zeros(n, dtype=np.int64)
+        self.direction = np.zeros(n, dtype=np.int64)
+        self.egg_cells = np.full((n, MAX_EGGS), -1, dtype=np.int64)
+        self.egg_golden = np.zeros((n, MAX_EGGS), dtype=bool)
+        self.block_cells = np.zeros((n, MAX_BLOCKS), dtype=np.int64)
+        self.block_directions = np.zeros((n, MAX_BLOCKS), dtype=np.int64)
+        self.block_next = np.zeros((n, MAX_BLOCKS), dtype=np.int64)
+        self.block_alive = np.zeros((n, MAX_BLOCKS), dtype=bool)
+        self.next_spawn = np.zeros(n, dtype=np.int64)
+        self.time = np.zeros(n, dtype=np.int64)
+        self.ticks = np.zeros(n, dtype=np.int64)
+        self.eggs_collected = np.zeros(n, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.dead = np.zeros(n, dtype=bool)
+        self.death_cause = np.zeros(n, dtype=np.int8)
+        self.reset()
+
+    def reset(self, mask=None):
+        boards = np.arange(self.boards) if mask is None else np.flatnonzero(mask)
+        if boards.size == 0:
+            return
+        self.grid[boards] = 0
+        self.head_index[boards] = 0
+        self.length[boards] = 1
+        self.body[boards, 0] = self.start_cell
+        self.grid[boards, self.start_cell] = SNAKE
+        self.direction[boards] = 3
+        self.egg_cells[boards] = -1
+        self.egg_golden[boards] = False
+        self.block_alive[boards] = False
+        self.time[boards] = 0
+        self.ticks[boards] = 0
+        self.eggs_collected[boards] = 0
+        self.score[boards] = 0
+        self.dead[boards] = False
+        self.death_cause[boards] = 0
+        self.next_spawn[boards] = self.rng.integers(1500, 3001, boards.size)
+        for _ in range(SPIKE_COUNT):
+            cells, placed = self.sample_free(boards)
+            self.grid[placed, cells] |= SPIKES
+        self.generate_eggs(boards)
+
+    def sample_free(self, boards):
+        # one free spawn cell per board: a few rounds of rejection, then an exact pick for the rest
+        cells = self.spawn_cells[self.rng.integers(0, self.spawn_cells.size, boards.size)]
+        for _ in range(8):
+            taken = (self.grid[boards, cells] & (SNAKE | EGG | SPIKES)) != 0
+            if not taken.any():
+                return cells, boards
+            cells[taken] = self.spawn_cells[self.rng.integers(0, self.spawn_cells.size, int(taken.sum()))]
+        taken = (self.grid[boards, cells] & (SNAKE | EGG | SPIKES)) != 0
+        keep = ~taken
+        for i in np.flatnonzero(taken):
+            free = self.spawn_cells[(self.grid[boards[i], self.spawn_cells] & (SNAKE | EGG | SPIKES)) == 0]
+            if free.size:
+                cells[i] = free[self.rng.integers(free.size)]
+                keep[i] = True
+        return cells[keep], boards[keep]
+
+    def generate_eggs(self, boards):
+        chance = 0.05 * self.upgrades["golden_egg_chance"][boards]
+        for slot in range(MAX_EGGS):
+            cells, placed = self.sample_free(boards)
+            self.grid[placed, cells] |= EGG
+            self.egg_cells[placed, slot] = cells
+            golden = self.rng.random(boards.size) < chance
+            self.egg_golden[placed, slot] = golden[np.isin(boards, placed)]
+
+    def spawn_blocks(self, boards):
+        side = self.rng.integers(0, 4, boards.size)
+        lengths = self.lane_lengths[side]
+        start = (self.rng.random(boards.size) * lengths).astype(np.int64)
+        # probe each lane from its random start to the first cell the snake isn't on
+        offsets = np.arange(self.lanes.shape[1])
+        order = (start[:, None] + offsets[None, :]) % lengths[:, None]
+        cells = self.lanes[side[:, None], order]
+        usable = (offsets[None, :] < lengths[:, None]) & ((self.grid[boards[:, None], cells] & SNAKE) == 0)
+        found = usable.any(axis=1)
+        first = usable.argmax(axis=1)
+        slot = (~self.block_alive[boards]).argmax(axis=1)
+        found &= ~self.block_alive[boards, slot]
+        boards = boards[found]
+        slot = slot[found]
+        self.block_cells[boards, slot] = cells[found, first[found]]
+        self.block_directions[boards, slot] = self.lane_directions[side[found]]
+        self.block_next[boards, slot] = self.next_spawn[boards] + BLOCK_MOVE_INTERVAL
+        self.block_alive[boards, slot] = True
+
+    def update_blocks(self, now):
+        spawning = np.flatnonzero(~self.dead & (self.next_spawn <= now))
+        if spawning.size:
+            self.spawn_blocks(spawning)
+            self.next_spawn[spawning] += self.rng.integers(1500, 3001, spawning.size)
+
+        boards, slots = np.nonzero(self.block_alive & (self.block_next <= now[:, None]) & ~self.dead[:, None])
+        if boards.size:
+            direction = self.block_directions[boards, slots]
+            cells = self.block_cells[boards, slots]
+            x = cells % self.cols + DX[direction]
+            y = cells // self.cols + DY[direction]
+            self.block_cells[boards, slots] = y * self.cols + x
+            self.block_next[boards, slots] += BLOCK_MOVE_INTERVAL
+            outside = (x < 1) | (x >= self.cols - 1) | (y < 1) | (y >= self.rows - 1)
+            self.block_alive[boards[outside], slots[outside]] = False
+
+    def step(self, actions=None):
+        # one snake move on every live board, returns eggs gained per board
+        gained = np.zeros(self.boards, dtype=np.int64)
+        live = ~self.dead
+        if not live.any():
+            return gained
+        now = self.time + MOVE_INTERVAL
+        self.update_blocks(now)
+
+        if actions is not None:
+            actions = np.asarray(actions)
+            turn = live & (actions >= 0)
+            turn &= actions != OPPOSITE[self.direction]
+            self.direction[turn] = actions[turn]
+
+        boards = np.flatnonzero(live)
+        self.time[boards] = now[boards]
+        self.ticks[boards] += 1
+        direction = self.direction[boards]
+        head = self.body[boards, self.head_index[boards]]
+        x = head % self.cols + DX[direction]
+        y = head // self.cols + DY[direction]
+        new_head = y * self.cols + x
+
+        wall = (x < 1) | (x >= self.cols - 1) | (y < 1) | (y >= self.rows - 1)
+        new_head[wall] = 0
+        block = ((self.block_cells[boards] == new_head[:, None]) & self.block_alive[boards]).any(axis=1) & ~wall
+        occupied = self.grid[boards, new_head]
+        snake = ((occupied & SNAKE) != 0) & ~wall & ~block
+        spikes = ((occupied & SPIKES) != 0) & ~wall & ~block & ~snake
+        # same cause codes as the replay log: wall, self, spikes, moving block
+        cause = np.select([wall, snake, spikes, block], [1, 2, 3, 4], 0)
+        dying = cause != 0
+        self.dead[boards[dying]] = True
+        self.death_cause[boards[dying]] = cause[dying]
+
+        boards = boards[~dying]
+        new_head = new_head[~dying]
+        if boards.size == 0:
+            return gained
+        self.head_index[boards] = (self.head_index[boards] + 1) % self.cells
+        self.body[boards, self.head_index[boards]] = new_head
+        self.grid[boards, new_head] |= SNAKE
+
+        # pickups: the head cell, plus everything in magnet range
+        eggs = self.egg_cells[boards]
+        magnet = self.upgrades["egg_magnet"][boards]
+        dx = eggs % self.cols - (new_head % self.cols)[:, None]
+        dy = eggs // self.cols - (new_head // self.cols)[:, None]
+        hit = (eggs >= 0) & ((eggs == new_head[:, None]) |
+                             ((magnet[:, None] > 0) & (dx * dx + dy * dy <= (magnet * magnet)[:, None])))
+        if hit.any():
+            value = np.where(self.egg_golden[boards], 10, 1) * hit
+            collected = value.sum(axis=1)
+            earned = collected * self.upgrades["currency_multiplier"][boards]
+            gained[boards] = earned
+            self.score[boards] += earned
+            self.eggs_collected[boards] += collected
+            rows, slots = np.nonzero(hit)
+            self.grid[boards[rows], eggs[rows, slots]] &= ~np.uint8(EGG)
+            eggs[hit] = -1
+            self.egg_cells[boards] = eggs
+            empty = boards[(eggs < 0).all(axis=1)]
+            if empty.size:
+                self.generate_eggs(empty)
+
+        grow = self.eggs_collected[boards] >= self.upgrades["grow_rate"][boards]
+        self.eggs_collected[boards[grow]] = 0
+        self.length[boards[grow]] += 1
+        shrink = boards[~grow]
+        tail = self.body[shrink, (self.head_index[shrink] - self.length[shrink]) % self.cells]
+        self.grid[shrink, tail] &= ~np.uint8(SNAKE)
+        return gained
+
+    def observation(self):
+        # (boards, rows, cols) grid flags, moving blocks included
+        grid = self.grid.copy()
+        boards, slots = np.nonzero(self.block_alive)
+        grid[boards, self.block_cells[boards, slots]] |= BLOCK
+        return grid.reshape(self.boards, self.rows, self.cols)
+
+    def heads(self):
+        return self.body[np.arange(self.boards), self.head_index]
+
+
+def wander_actions(env):
+    # headless.wander_policy for every board: keep going unless it runs into something
+    head = env.heads()
+    grid = env.observation().reshape(env.boards, -1)
+    options = np.stack([env.direction, np.array([2, 3, 1, 0])[env.direction], np.array([3, 2, 0, 1])[env.direction]], axis=1)
+    x = (head % env.cols)[:, None] + DX[options]
+    y = (head // env.cols)[:, None] + DY[options]
+    inside = (x >= 1) & (x < env.cols - 1) & (y >= 1) & (y < env.rows - 1)
+    cells = np.where(inside, y * env.cols + x, 0)
+    safe = inside & ((grid[np.arange(env.boards)[:, None], cells] & (SNAKE | SPIKES | BLOCK)) == 0)
+    choice = np.where(safe.any(axis=1), safe.argmax(axis=1), 0)
+    actions = options[np.arange(env.boards), choice]
+    actions[choice == 0] = NO_ACTION
+    return actions
+
+
+if __name__ == "__main__":
+    boards = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    steps = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    env = BatchSimulation(boards, seed=0)
+    start = time.perf_counter()
+    for _ in range(steps):
+        env.step(wander_actions(env))
+        if env.dead.all():
+            break
+    elapsed = time.perf_counter() - start
+    ticks = int(env.ticks.sum())
+    print(f"{boards} boards, {ticks} ticks in {elapsed:.2f}s ({ticks / elapsed:,.0f} ticks/s)")
+    print(f"avg score: {env.score.mean():.2f}, alive: {int((~env.dead).sum())}")
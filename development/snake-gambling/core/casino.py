@@ -0,0 +1,123 @@
+import copy
+from types import SimpleNamespace
+
+# default tables, Gambling copies these so they can be tuned per instance
+SLOTS = ["lemon", "cherry", "orange", "banana", "grape", "strawberry", "melon"]
+
+SLOT_MULTIPLIERS = {
+    "lemon": 1.25,
+    "cherry": 1.5,
+    "orange": 2.0,
+    "banana": 2.5,
+    "grape": 3.0,
+    "strawberry": 5.0,
+    "melon": 7.5
+}
+
+NO_MATCH_MULTIPLIER = 0.5
+
+WHEEL_SECTIONS = [
+    {"name": "1 POINT", "multiplier": 0.5, "odds": 0.48, "ranges": [
+        (350, 3), (18, 31), (46, 59), (74, 88), (103, 117), (147, 160),
+        (175, 189), (204, 219), (234, 248), (264, 278), (293, 308), (322, 336)
+    ]},
+    {"name": "3 POINT", "multiplier": 1.25, "odds": 0.24, "ranges": [
+        (4, 17), (60, 73), (132, 146), (190, 203), (249, 263), (309, 321)
+    ]},
+    {"name": "5 POINT", "multiplier": 2.0, "odds": 0.16, "ranges": [
+        (89, 102), (118, 131), (220, 233), (337, 349)
+    ]},
+    {"name": "10 POINT", "multiplier": 5.0, "odds": 0.08, "ranges": [
+        (32, 45), (161, 174)
+    ]},
+    {"name": "20 POINT", "multiplier": 10.0, "odds": 0.04, "ranges": [
+        (279, 292)
+    ]}
+]
+
+
+def default_config():
+    return SimpleNamespace(
+        slots=list(SLOTS),
+        slot_multipliers=dict(SLOT_MULTIPLIERS),
+        wheel_sections=copy.deepcopy(WHEEL_SECTIONS)
+    )
+
+
+def slot_multiplier(results, multipliers):
+    # (multiplier, matched) for three reel results
+    distinct = set(results)
+    if len(distinct) == 1:
+        return multipliers[results[0]] * 3, True
+    if len(distinct) == 2:
+        for fruit in distinct:
+            if results.count(fruit) == 2:
+                return multipliers[fruit] * 1, True
+    return NO_MATCH_MULTIPLIER, False
+
+
+def roll_slots(rng, slots):
+    # the whole outcome of one spin: reels 2 and 3 never stop on reel 1's fruit, like the old
+    # stop correction that rerolled them, so only reels 2 and 3 can pair and triples never land
+    first = rng.choice(slots)
+    others = [f for f in slots if f != first]
+    return [first, rng.choice(others), rng.choice(others)]
+
+
+def slot_outcomes(slots):
+    # every result roll_slots can land with its chance, it has to change with roll_slots
+    for first in slots:
+        others = [f for f in slots if f != first]
+        chance = 1 / (len(slots) * len(others) * len(others))
+        for second in others:
+            for third in others:
+                yield [first, second, third], chance
+
+
+def reel_strip(rng, slots, final, length):
+    # symbols a reel scrolls through, built backwards so it ends on the result
+    strip = [final]
+    for _ in range(length - 1):
+        strip.append(rng.choice([f for f in slots if f != strip[-1]]))
+    strip.reverse()
+    return strip
+
+
+class WheelTable:
+    # angle -> section lookup at tenth-of-a-degree resolution
+    # ranges are whole degrees, (start, end) covers start up to but not including end + 1
+    def __init__(self, sections, resolution=10):
+        self.sections = sections
+        self.resolution = resolution
+        self.size = 360 * resolution
+        table = [None] * self.size
+        self.spans = []
+        for index, section in enumerate(sections):
+            spans = []
+            for start, end in section["ranges"]:
+                length = (end - start) % 360 + 1
+                spans.append((start, length))
+                for cell in range(start * resolution, (start + length) * resolution):
+                    cell %= self.size
+                    if table[cell] is not None:
+                        raise ValueError(
+                            f"wheel range ({start}, {end}) of {section['name']} overlaps "
+                            f"{sections[table[cell]]['name']} at {cell / resolution}°"
+                        )
+                    table[cell] = index
+            self.spans.append(spans)
+
+        gaps = sorted({cell // resolution for cell, index in enumerate(table) if index is None})
+        if gaps:
+            raise ValueError(f"wheel sections leave degrees uncovered: {gaps}")
+        self.table = bytes(table)
+
+    def section_index(self, angle):
+        return self.table[int((angle % 360) * self.resolution) % self.size]
+
+    def section_at(self, angle):
+        return self.sections[self.section_index(angle)]
+
+    def random_angle(self, rng, index):
+        start, length = rng.choice(self.spans[index])
+        return (start + rng.random() * length) % 360
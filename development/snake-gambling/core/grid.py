@@ -0,0 +1,85 @@
+SNAKE = 1
+EGG = 2
+SPIKES = 4
+BLOCK = 8
+
+
+class OccupancyGrid:
+    def __init__(self, width, height, cell=20):
+        self.cell = cell
+        self.cols = width // cell
+        self.rows = height // cell
+        self.cells = bytearray(self.cols * self.rows)
+        # moving blocks can stack on the same cell, so they are counted
+        self.block_counts = bytearray(self.cols * self.rows)
+
+    def index(self, pos):
+        return (pos[1] // self.cell) * self.cols + pos[0] // self.cell
+
+    def position(self, index):
+        return ((index % self.cols) * self.cell, (index // self.cols) * self.cell)
+
+    def clear(self):
+        self.cells[:] = bytes(len(self.cells))
+        self.block_counts[:] = bytes(len(self.block_counts))
+
+    def add(self, pos, flag):
+        self.cells[self.index(pos)] |= flag
+
+    def remove(self, pos, flag):
+        self.cells[self.index(pos)] &= ~flag
+
+    def has(self, pos, flags):
+        return self.cells[self.index(pos)] & flags
+
+    def is_free(self, pos):
+        return self.cells[self.index(pos)] == 0
+
+    def add_block(self, pos):
+        i = self.index(pos)
+        self.block_counts[i] += 1
+        self.cells[i] |= BLOCK
+
+    def remove_block(self, pos):
+        i = self.index(pos)
+        self.block_counts[i] -= 1
+        if self.block_counts[i] == 0:
+            self.cells[i] &= ~BLOCK
+
+
+class FreeCellSampler:
+    # swap-remove set of free cells: O(1) add, discard and uniform draw
+    def __init__(self, region):
+        self.region = frozenset(region)
+        self.cells = []
+        self.slots = {}
+
+    def reset(self):
+        self.cells = list(self.region)
+        self.cells.sort()
+        self.slots = {pos: i for i, pos in enumerate(self.cells)}
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, pos):
+        return pos in self.slots
+
+    def add(self, pos):
+        if pos in self.region and pos not in self.slots:
+            self.slots[pos] = len(self.cells)
+            self.cells.append(pos)
+
+    def discard(self, pos):
+        i = self.slots.pop(pos, None)
+        if i is None:
+            return
+        last = self.cells.pop()
+        if i < len(self.cells):
+            self.cells[i] = last
+            self.slots[last] = i
+
+    def sample(self, rng):
+        if not self.cells:
+            return None
+        return self.cells[rng.randrange(len(self.cells))]
@@ -0,0 +1,113 @@
+import os
+import struct
+import sys
+import tempfile
+import time
+
+MAGIC = b"EGGJ\x01"
+# timestamp, source, delta, balance after the change
+RECORD = struct.Struct("<dBiq")
+SOURCES = ("snapshot", "collect", "shop", "bet", "slots", "wheel")
+SOURCE_CODES = {source: code for code, source in enumerate(SOURCES)}
+
+
+def read_records(data):
+    if not data.startswith(MAGIC):
+        raise ValueError("not an egg journal")
+    records = []
+    end = len(data) - (len(data) - len(MAGIC)) % RECORD.size
+    for timestamp, code, delta, balance in RECORD.iter_unpack(data[len(MAGIC):end]):
+        records.append((timestamp, SOURCES[code], delta, balance))
+    # a torn last record from a crash mid-append is dropped
+    return records, end
+
+
+def audit(records):
+    # records whose balance doesn't follow from the one before it
+    problems = []
+    balance = None
+    for index, (timestamp, source, delta, after) in enumerate(records):
+        if source != "snapshot" and balance is not None and balance + delta != after:
+            problems.append((index, balance + delta, after))
+        balance = after
+    return problems
+
+
+class EggJournal:
+    # append-only log of egg balance changes, compacted into a snapshot record now and then
+    def __init__(self, path='egg_journal.bin', compact_every=1000):
+        self.path = path
+        self.compact_every = compact_every
+        self.file = None
+        self.balance = None
+        self.since_snapshot = 0
+
+    def open(self, balance):
+        # returns the recovered balance, or balance when there is no usable journal yet
+        records = []
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'rb') as f:
+                    data = f.read()
+                records, end = read_records(data)
+                if end != len(data):
+                    with open(self.path, 'r+b') as f:
+                        f.truncate(end)
+            except Exception as e:
+                print(f"Error loading egg journal: {e}")
+                records = []
+        if records:
+            self.balance = records[-1][3]
+            self.since_snapshot = sum(1 for record in records if record[1] != "snapshot")
+            self.file = open(self.path, 'ab')
+            if self.since_snapshot >= self.compact_every:
+                self.compact()
+        else:
+            self.balance = balance
+            self.compact()
+        return self.balance
+
+    def record(self, source, delta, balance):
+        self.file.write(RECORD.pack(time.time(), SOURCE_CODES[source], delta, balance))
+        self.file.flush()
+        self.balance = balance
+        self.since_snapshot += 1
+        if self.since_snapshot >= self.compact_every:
+            self.compact()
+
+    def compact(self):
+        # swap the journal for one snapshot of the current balance, renamed in like the save file
+        if self.file is not None:
+            self.file.close()
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(prefix=".journal_", suffix=".tmp", dir=directory)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(MAGIC + RECORD.pack(time.time(), SOURCE_CODES["snapshot"], 0, self.balance))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        self.file = open(self.path, 'ab')
+        self.since_snapshot = 0
+
+    def close(self):
+        if self.file is not None:
+            os.fsync(self.file.fileno())
+            self.file.close()
+            self.file = None
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else 'egg_journal.bin'
+    with open(path, 'rb') as f:
+        records, end = read_records(f.read())
+    totals = {}
+    for timestamp, source, delta, balance in records:
+        totals[source] = totals.get(source, 0) + delta
+    print(f"{path}: {len(records)} records, balance {records[-1][3] if records else 0}")
+    for source, total in totals.items():
+        if source != "snapshot":
+            print(f"  {source}: {total:+d}")
+    problems = audit(records)
+    for index, expected, found in problems:
+        print(f"  record {index}: balance {found}, expected {expected}")
+    print("  OK" if not problems else f"  {len(problems)} inconsistent records")
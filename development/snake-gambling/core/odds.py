@@ -0,0 +1,46 @@
+from core.casino import slot_outcomes, slot_multiplier
+
+
+class SlotOdds:
+    # exact odds of the slots, summed over every result roll_slots can land
+    def __init__(self, config):
+        self.config = config
+        self.key = None
+        self.result = None
+
+    def config_key(self, bet):
+        config = self.config
+        return (
+            tuple(config.slots),
+            tuple(config.slot_multipliers[f] for f in config.slots),
+            bet
+        )
+
+    def solve(self, bet=10):
+        key = self.config_key(bet)
+        if key == self.key:
+            return self.result
+
+        config = self.config
+        rtp = second_moment = triple = pair = 0.0
+        for results, chance in slot_outcomes(config.slots):
+            multiplier, matched = slot_multiplier(results, config.slot_multipliers)
+            # payouts are truncated to whole eggs like check_slots_win does
+            payout = int(bet * multiplier) / bet
+            rtp += chance * payout
+            second_moment += chance * payout * payout
+            if matched and len(set(results)) == 1:
+                triple += chance
+            elif matched:
+                pair += chance
+
+        self.result = {
+            "bet": bet,
+            "rtp": rtp,
+            "variance": second_moment - rtp * rtp,
+            "hit_frequency": triple + pair,
+            "triple_rate": triple,
+            "pair_rate": pair
+        }
+        self.key = key
+        return self.result
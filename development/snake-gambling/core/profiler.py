@@ -0,0 +1,130 @@
+import csv
+import json
+import time
+from collections import deque
+
+
+class _Section:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, (time.perf_counter() - self.start) * 1000)
+        return False
+
+
+class _NullSection:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_null_section = _NullSection()
+
+
+class FrameProfiler:
+    def __init__(self, target_fps=60, window=300, max_trace_frames=36000):
+        self.enabled = False
+        self.budget_ms = 1000 / target_fps
+        self.window = window
+        self.samples = {}
+        self.frame_times = deque(maxlen=window)
+        self.frames = 0
+        self.dropped_frames = 0
+        self.over_budget_frames = 0
+        self.last_frame_start = None
+        self.current = {}
+        self.trace = deque(maxlen=max_trace_frames)
+
+    def reset(self):
+        self.samples = {}
+        self.frame_times.clear()
+        self.frames = 0
+        self.dropped_frames = 0
+        self.over_budget_frames = 0
+        self.last_frame_start = None
+        self.current = {}
+        self.trace.clear()
+
+    def section(self, name):
+        if not self.enabled:
+            return _null_section
+        return _Section(self, name)
+
+    def record(self, name, ms):
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples[name] = deque(maxlen=self.window)
+        samples.append(ms)
+        self.current[name] = self.current.get(name, 0) + ms
+
+    def begin_frame(self):
+        if not self.enabled:
+            self.last_frame_start = None
+            return
+        now = time.perf_counter()
+        if self.last_frame_start is not None:
+            # time between frame starts includes clock.tick, so this is the real frame time
+            frame_ms = (now - self.last_frame_start) * 1000
+            self.frame_times.append(frame_ms)
+            if frame_ms > self.budget_ms * 1.5:
+                self.dropped_frames += 1
+        self.last_frame_start = now
+        self.current = {}
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        self.frames += 1
+        work_ms = sum(self.current.get(name, 0) for name in ("handle_input", "update", "draw"))
+        if work_ms > self.budget_ms:
+            self.over_budget_frames += 1
+        entry = {"frame": self.frames, "time": time.time()}
+        entry.update(self.current)
+        self.trace.append(entry)
+
+    @staticmethod
+    def percentile(values, p):
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        index = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def stats(self, name):
+        values = self.frame_times if name == "frame" else self.samples.get(name, ())
+        return {
+            "p50": self.percentile(values, 50),
+            "p95": self.percentile(values, 95),
+            "p99": self.percentile(values, 99),
+        }
+
+    def section_names(self):
+        return list(self.samples.keys())
+
+    def dump(self, path):
+        rows = list(self.trace)
+        if path.endswith(".json"):
+            with open(path, "w") as f:
+                json.dump({
+                    "budget_ms": self.budget_ms,
+                    "frames": self.frames,
+                    "dropped_frames": self.dropped_frames,
+                    "over_budget_frames": self.over_budget_frames,
+                    "trace": rows
+                }, f)
+            return path
+        fields = ["frame", "time"] + sorted({key for row in rows for key in row} - {"frame", "time"})
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(rows)
+        return path
@@ -0,0 +1,147 @@
+import os
+import struct
+import sys
+import time
+from core.simulation import Simulation, UP, DOWN, LEFT, RIGHT
+
+MAGIC = b"SNKR"
+VERSION = 1
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+UPGRADES = ("grow_rate", "currency_multiplier", "egg_magnet", "golden_egg_chance")
+DEATH_CAUSES = (None, "wall", "self", "spikes", "moving_block")
+
+# magic, version, seed, board size, upgrade levels, input count
+HEADER = struct.Struct("<4sBQHH4HI")
+# ticks, score, eggs earned, length, death cause
+FOOTER = struct.Struct("<IIIIB")
+
+
+def write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, offset):
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+class ReplayLog:
+    # one round: the board seed, upgrades and every accepted input keyed by tick
+    def __init__(self, seed, upgrades, inputs=(), width=1260, height=720, result=None):
+        self.seed = seed
+        self.upgrades = {name: upgrades[name] for name in UPGRADES}
+        self.inputs = list(inputs)
+        self.width = width
+        self.height = height
+        self.result = result
+
+    @classmethod
+    def from_simulation(cls, sim):
+        return cls(sim.rng.seed, sim.upgrades, sim.inputs, sim.width, sim.height, {
+            "ticks": sim.ticks,
+            "score": sim.total_eggs_collected,
+            "eggs": sim.eggs_earned,
+            "length": len(sim.snake),
+            "death_cause": sim.death_cause
+        })
+
+    def to_bytes(self):
+        out = bytearray(HEADER.pack(
+            MAGIC, VERSION, self.seed, self.width, self.height,
+            *(self.upgrades[name] for name in UPGRADES), len(self.inputs)
+        ))
+        # tick deltas and the direction share one varint, most inputs fit in a byte
+        last_tick = 0
+        for tick, direction in self.inputs:
+            write_varint(out, (tick - last_tick) << 2 | DIRECTION_CODES[direction])
+            last_tick = tick
+        result = self.result or {"ticks": 0, "score": 0, "eggs": 0, "length": 0, "death_cause": None}
+        out += FOOTER.pack(result["ticks"], result["score"], result["eggs"], result["length"],
+                           DEATH_CAUSES.index(result["death_cause"]))
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, seed, width, height, *levels, count = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("not a replay file")
+        if version != VERSION:
+            raise ValueError(f"unsupported replay version {version}")
+        offset = HEADER.size
+        inputs = []
+        tick = 0
+        for _ in range(count):
+            value, offset = read_varint(data, offset)
+            tick += value >> 2
+            inputs.append((tick, DIRECTIONS[value & 3]))
+        ticks, score, eggs, length, cause = FOOTER.unpack_from(data, offset)
+        result = {"ticks": ticks, "score": score, "eggs": eggs, "length": length,
+                  "death_cause": DEATH_CAUSES[cause]}
+        return cls(seed, dict(zip(UPGRADES, levels)), inputs, width, height, result)
+
+    def save(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+    def schedule(self):
+        scheduled = {}
+        for tick, direction in self.inputs:
+            scheduled.setdefault(tick, []).append(direction)
+        return scheduled
+
+    def start(self, sim, current_time=0):
+        # puts sim at the start of this round, the inputs are fed back in as the ticks come up
+        sim.upgrades = dict(self.upgrades)
+        sim.reset(current_time, self.seed)
+        sim.scheduled_inputs = self.schedule()
+
+
+def fast_forward(log, max_ticks=None):
+    sim = Simulation(log.width, log.height)
+    log.start(sim)
+    if max_ticks is None:
+        max_ticks = log.result["ticks"] if log.result else 10 ** 9
+    while not sim.dead and sim.ticks < max_ticks:
+        sim.step()
+    return sim
+
+
+def verify(log):
+    # (matches, replayed result) for a recorded round
+    replayed = ReplayLog.from_simulation(fast_forward(log)).result
+    return replayed == log.result, replayed
+
+
+if __name__ == "__main__":
+    for path in sys.argv[1:]:
+        log = ReplayLog.load(path)
+        start = time.perf_counter()
+        ok, replayed = verify(log)
+        elapsed = time.perf_counter() - start
+        rate = replayed["ticks"] / elapsed if elapsed > 0 else 0
+        print(f"{path}: seed {log.seed}, {len(log.inputs)} inputs, {replayed['ticks']} ticks "
+              f"in {elapsed * 1000:.1f}ms ({rate:,.0f} ticks/s)")
+        print(f"  recorded {log.result}")
+        if not ok:
+            print(f"  replayed {replayed}")
+        print("  OK" if ok else "  MISMATCH")
@@ -0,0 +1,67 @@
+import random
+import numpy as np
+
+STREAMS = ("board", "spawns", "slots", "wheel", "cosmetic", "rounds")
+
+
+class RandomStream:
+    # random.Random-style draws served from pre-generated NumPy blocks
+    def __init__(self, generator, block_size=4096):
+        self.generator = generator
+        self.block_size = block_size
+        self.next_value = iter(()).__next__
+
+    def random(self):
+        try:
+            return self.next_value()
+        except StopIteration:
+            # tolist() so each draw is a plain list iteration instead of a NumPy scalar
+            self.next_value = iter(self.generator.random(self.block_size).tolist()).__next__
+            return self.next_value()
+
+    def randrange(self, start, stop=None, step=1):
+        if stop is None:
+            start, stop = 0, start
+        count = (stop - start + step - 1) // step
+        if count <= 0:
+            raise ValueError(f"empty range for randrange({start}, {stop}, {step})")
+        return start + step * int(self.random() * count)
+
+    def randint(self, a, b):
+        return a + int(self.random() * (b - a + 1))
+
+    def choice(self, seq):
+        if not seq:
+            raise IndexError("cannot choose from an empty sequence")
+        return seq[int(self.random() * len(seq))]
+
+    def uniform(self, a, b):
+        return a + (b - a) * self.random()
+
+    def randoms(self, count):
+        return self.generator.random(count)
+
+    def integers(self, low, high, count):
+        return self.generator.integers(low, high, count)
+
+
+class RandomStreams:
+    def __init__(self, seed=None):
+        self.reseed(seed)
+
+    def reseed(self, seed=None):
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(63)
+        self.seed = seed
+        children = np.random.SeedSequence(seed).spawn(len(STREAMS))
+        self.streams = {
+            name: RandomStream(np.random.Generator(np.random.PCG64(child)))
+            for name, child in zip(STREAMS, children)
+        }
+        # streams are plain attributes too, e.g. rng.board
+        for name, stream in self.streams.items():
+            setattr(self, name, stream)
+
+    def stream(self, name):
+        return self.streams[name]
+
@@ -0,0 +1,146 @@
+import sys
+import time
+import numpy as np
+from core.casino import default_config, slot_outcomes, slot_multiplier
+from core.odds import SlotOdds
+
+MAX_STREAK = 64
+
+
+class StreakCounter:
+    # histogram of losing streak lengths, ended by a hit
+    def __init__(self, players):
+        self.current = np.zeros(players, dtype=np.int64)
+        self.histogram = np.zeros(MAX_STREAK + 1, dtype=np.int64)
+        self.longest = 0
+
+    def update(self, hit):
+        ended = self.current[hit]
+        if ended.size:
+            self.histogram += np.bincount(np.minimum(ended, MAX_STREAK), minlength=MAX_STREAK + 1)
+        self.current += 1
+        self.current[hit] = 0
+        self.longest = max(self.longest, int(self.current.max()))
+
+    def report(self):
+        total = self.histogram.sum()
+        lengths = np.arange(MAX_STREAK + 1)
+        return {
+            "mean_losing_streak": float((self.histogram * lengths).sum() / total) if total else 0.0,
+            "longest_losing_streak": self.longest,
+            "losing_streaks": {int(n): int(c) for n, c in enumerate(self.histogram) if c}
+        }
+
+
+def summarize(rounds, bet, total_win, total_sq, hits):
+    mean = total_win / (rounds * bet)
+    variance = total_sq / rounds - mean * mean
+    return {
+        "rounds": rounds,
+        "bet": bet,
+        "rtp": mean,
+        "variance": variance,
+        "stddev": variance ** 0.5,
+        "hit_frequency": hits / rounds
+    }
+
+
+def simulate_slots(config=None, rounds=10_000_000, players=100_000, bet=10, seed=None):
+    # players play in parallel, each keeps its own losing streak across its rounds
+    config = config or default_config()
+    rng = np.random.default_rng(seed)
+    # every result roll_slots can land, sampled by index so the rule lives in one place
+    outcomes = list(slot_outcomes(config.slots))
+    chances = np.array([chance for _, chance in outcomes])
+    scored = [slot_multiplier(results, config.slot_multipliers) for results, _ in outcomes]
+    payouts = np.array([int(bet * multiplier) for multiplier, _ in scored])
+    matched = np.array([matched for _, matched in scored])
+    is_triple = matched & np.array([len(set(results)) == 1 for results, _ in outcomes])
+
+    steps = max(1, rounds // players)
+    streaks = StreakCounter(players)
+    total_win = 0
+    total_sq = 0.0
+    hits = triples = 0
+
+    for _ in range(steps):
+        index = rng.choice(len(outcomes), players, p=chances)
+        win = payouts[index]
+        hit = matched[index]
+        total_win += int(win.sum())
+        total_sq += float(((win / bet) ** 2).sum())
+        hits += int(hit.sum())
+        triples += int(is_triple[index].sum())
+        streaks.update(hit)
+
+    played = steps * players
+    report = summarize(played, bet, total_win, total_sq, hits)
+    report.update(streaks.report())
+    report["triple_rate"] = triples / played
+    report["pair_rate"] = (hits - triples) / played
+    return report
+
+
+def check_slots(report, config=None, tolerance=4):
+    # the simulated RTP against the exact one, off by how many standard errors of the estimate
+    exact = SlotOdds(config or default_config()).solve(report["bet"])["rtp"]
+    error = (report["rtp"] - exact) / (report["stddev"] / report["rounds"] ** 0.5)
+    return exact, error, abs(error) <= tolerance
+
+
+def simulate_wheel(config=None, rounds=10_000_000, players=100_000, bet=10, seed=None):
+    config = config or default_config()
+    rng = np.random.default_rng(seed)
+    sections = config.wheel_sections
+    cumulative = np.cumsum([section["odds"] for section in sections])
+    multipliers = np.array([section["multiplier"] for section in sections])
+
+    steps = max(1, rounds // players)
+    streaks = StreakCounter(players)
+    section_counts = np.zeros(len(sections), dtype=np.int64)
+    total_win = 0
+    total_sq = 0.0
+    hits = 0
+
+    for _ in range(steps):
+        index = np.searchsorted(cumulative, rng.random(players), side="left")
+        # get_random_section falls back to the first section past the cumulative odds
+        index[index >= len(sections)] = 0
+        win = np.floor(bet * multipliers[index])
+        hit = win >= bet
+        section_counts += np.bincount(index, minlength=len(sections))
+        total_win += int(win.sum())
+        total_sq += float(((win / bet) ** 2).sum())
+        hits += int(hit.sum())
+        streaks.update(hit)
+
+    played = steps * players
+    report = summarize(played, bet, total_win, total_sq, hits)
+    report.update(streaks.report())
+    report["section_share"] = {
+        section["name"]: int(count) / played for section, count in zip(sections, section_counts)
+    }
+    return report
+
+
+def print_report(name, report, elapsed):
+    print(f"{name}: {report['rounds']:,} rounds in {elapsed:.2f}s")
+    print(f"  RTP {report['rtp']:.4%}  stddev {report['stddev']:.3f}  hit frequency {report['hit_frequency']:.4%}")
+    print(f"  losing streaks: mean {report['mean_losing_streak']:.2f}, longest {report['longest_losing_streak']}")
+    for key in ("triple_rate", "pair_rate", "section_share"):
+        if key in report:
+            print(f"  {key}: {report[key]}")
+
+
+if __name__ == "__main__":
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    bet = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    ok = True
+    for name, simulate in (("slots", simulate_slots), ("wheel", simulate_wheel)):
+        start = time.perf_counter()
+        report = simulate(rounds=rounds, bet=bet, seed=0)
+        print_report(name, report, time.perf_counter() - start)
+        if name == "slots":
+            exact, error, ok = check_slots(report)
+            print(f"  exact RTP {exact:.4%}, simulated is {error:+.2f} standard errors off: {'OK' if ok else 'MISMATCH'}")
+    sys.exit(0 if ok else 1)
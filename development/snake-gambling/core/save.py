@@ -0,0 +1,120 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from core.simulation import DEFAULT_UPGRADES
+
+SAVE_VERSION = 2
+
+DEFAULT_SAVE = {
+    "version": SAVE_VERSION,
+    "eggs": 0,
+    "upgrades": DEFAULT_UPGRADES,
+    "owned_skins": ["default"],
+    "snake_skin": "default",
+    "settings": {
+        "use_arrow_keys": False,
+        "dirty_rendering": True
+    }
+}
+
+
+def migrate(data):
+    # version 1 files are the old {"eggs": n} saves
+    version = data.get("version", 1)
+    if version > SAVE_VERSION:
+        raise ValueError(f"save version {version} is newer than this game ({SAVE_VERSION})")
+    save = json.loads(json.dumps(DEFAULT_SAVE))
+    save["eggs"] = int(data.get("eggs", 0))
+    if version >= 2:
+        save["upgrades"].update({k: int(v) for k, v in data.get("upgrades", {}).items() if k in save["upgrades"]})
+        save["owned_skins"] = sorted(set(data.get("owned_skins", [])) | {"default"})
+        save["snake_skin"] = data.get("snake_skin", "default")
+        save["settings"].update({k: v for k, v in data.get("settings", {}).items() if k in save["settings"]})
+    return save
+
+
+def write_atomic(path, data):
+    # write a sibling temp file and rename it over the save, a crash leaves the old file intact
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=".save_", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class SaveStore:
+    # debounced saves written on a background thread so the frame never waits on the disk
+    def __init__(self, path='save_data.json', delay=0.5):
+        self.path = path
+        self.delay = delay
+        self.pending = None
+        self.requested = 0
+        self.writes = 0
+        self.condition = threading.Condition()
+        # held from taking a snapshot until it is on disk, so an older one never lands last
+        self.write_lock = threading.Lock()
+        self.thread = None
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return migrate({})
+        try:
+            with open(self.path, 'r') as f:
+                return migrate(json.load(f))
+        except Exception as e:
+            print(f"Error loading save data: {e}")
+            return migrate({})
+
+    def save(self, data):
+        # data has to be a snapshot, the writer thread reads it later
+        with self.condition:
+            self.pending = data
+            self.requested = time.monotonic()
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.writer, name="save-writer", daemon=True)
+                self.thread.start()
+            self.condition.notify()
+
+    def writer(self):
+        while True:
+            with self.condition:
+                while self.pending is None:
+                    self.condition.wait()
+                # wait until no new save came in for delay seconds
+                while True:
+                    remaining = self.requested + self.delay - time.monotonic()
+                    if remaining <= 0 or self.pending is None:
+                        break
+                    self.condition.wait(remaining)
+            with self.write_lock:
+                with self.condition:
+                    data = self.pending
+                    self.pending = None
+                if data is not None:
+                    self.write(data)
+
+    def write(self, data):
+        try:
+            write_atomic(self.path, data)
+            self.writes += 1
+        except Exception as e:
+            print(f"Error saving data: {e}")
+
+    def flush(self, data=None):
+        # synchronous write, used on quit
+        with self.write_lock:
+            with self.condition:
+                if data is None:
+                    data = self.pending
+                self.pending = None
+            if data is not None:
+                self.write(data)
@@ -0,0 +1,83 @@
+import heapq
+import itertools
+
+
+class Timer:
+    def __init__(self, time, priority, callback, args, interval):
+        self.time = time
+        self.priority = priority
+        self.callback = callback
+        self.args = args
+        self.interval = interval
+        # False once it has been cancelled or has fired for the last time
+        self.active = True
+
+
+class Scheduler:
+    # timers in a heap by due time, so a frame only does work for the timers that are due
+    def __init__(self, now=0):
+        # how fast this clock runs against the one advancing it, below 1 slows everything on it down
+        self.scale = 1
+        self.heap = []
+        self.reset(now)
+
+    def reset(self, now=0):
+        self.clear()
+        self.now = now
+        self.sequence = itertools.count()
+
+    def clear(self):
+        for entry in self.heap:
+            entry[3].active = False
+        self.heap = []
+        self.cancelled = 0
+
+    def at(self, time, callback, *args, priority=0, interval=None):
+        timer = Timer(time, priority, callback, args, interval)
+        self.push(timer)
+        return timer
+
+    def after(self, delay, callback, *args, priority=0):
+        return self.at(self.now + delay, callback, *args, priority=priority)
+
+    def every(self, interval, callback, *args, priority=0, start=None):
+        return self.at(self.now + interval if start is None else start, callback, *args,
+                       priority=priority, interval=interval)
+
+    def push(self, timer):
+        # timers due at the same time run by priority, then in the order they were scheduled
+        heapq.heappush(self.heap, (timer.time, timer.priority, next(self.sequence), timer))
+
+    def cancel(self, timer):
+        if timer is None or not timer.active:
+            return
+        timer.active = False
+        self.cancelled += 1
+        # cancelled timers are skipped when they come up, the heap is only rebuilt once they are most of it
+        if self.cancelled > 64 and self.cancelled * 2 > len(self.heap):
+            self.heap = [entry for entry in self.heap if entry[3].active]
+            heapq.heapify(self.heap)
+            self.cancelled = 0
+
+    def pending(self):
+        return len(self.heap) - self.cancelled
+
+    def run_until(self, time):
+        # callbacks see now as their own due time, even when a slow frame runs several at once
+        while self.heap and self.heap[0][0] <= time:
+            timer = heapq.heappop(self.heap)[3]
+            if not timer.active:
+                self.cancelled -= 1
+                continue
+            self.now = timer.time
+            if timer.interval is not None:
+                timer.time += timer.interval
+                self.push(timer)
+            else:
+                timer.active = False
+            timer.callback(*timer.args)
+        if time > self.now:
+            self.now = time
+
+    def advance(self, elapsed):
+        self.run_until(self.now + elapsed * self.scale)
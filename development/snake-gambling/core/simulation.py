@@ -0,0 +1,315 @@
+from collections import deque
+from core.rng import RandomStreams
+from core.grid import OccupancyGrid, FreeCellSampler, SNAKE, EGG, SPIKES, BLOCK
+from core.scheduler import Scheduler
+
+CELL = 20
+
+# upgrade levels of a new save, everything that runs boards starts from a copy of this
+DEFAULT_UPGRADES = {
+    "grow_rate": 1,
+    "currency_multiplier": 1,
+    "egg_magnet": 0,
+    "golden_egg_chance": 0
+}
+
+# block spawns and moves run before a snake move due at the same time
+SPAWN_PRIORITY = 0
+BLOCK_PRIORITY = 1
+MOVE_PRIORITY = 2
+
+UP = (0, -CELL)
+DOWN = (0, CELL)
+LEFT = (-CELL, 0)
+RIGHT = (CELL, 0)
+
+
+class Simulation:
+    def __init__(self, width=1260, height=720, upgrades=None, seed=None, rng=None):
+        self.width = width
+        self.height = height
+        self.upgrades = upgrades if upgrades is not None else dict(DEFAULT_UPGRADES)
+        self.rng = rng if rng is not None else RandomStreams(seed)
+        self.grid = OccupancyGrid(width, height, CELL)
+        # eggs and spikes spawn in the same cells the old randrange loops could reach
+        self.free_cells = FreeCellSampler(
+            (x, y) for x in range(CELL, width - 2 * CELL, CELL) for y in range(CELL, height - 2 * CELL, CELL)
+        )
+        self.move_interval = 100
+        # bumped whenever the static layout (spikes) changes
+        self.layout_version = 0
+        # cells whose contents changed, only recorded for the dirty-rect renderer
+        self.track_dirty = False
+        self.dirty_cells = set()
+        self.block_move_interval = 1000
+        # called before every move, a direction it returns is queued like an input
+        self.controller = None
+        # board time, set timers.scale below 1 to slow the board down against the caller's clock
+        self.timers = Scheduler()
+        self.reset()
+
+    def reset(self, current_time=0, seed=None):
+        if seed is not None:
+            self.rng.reseed(seed)
+        self.timers.reset(current_time)
+        self.time = current_time
+        # the caller's time at the last update, the board only advances by what passed since
+        self.clock = current_time
+        self.dirty_cells.clear()
+        self.grid.clear()
+        self.free_cells.reset()
+        self.snake = deque([(self.width//2 - (self.width//2 % CELL), self.height//2 - (self.height//2 % CELL))])
+        self.grid.add(self.snake[0], SNAKE)
+        self.free_cells.discard(self.snake[0])
+        self.direction = RIGHT
+        self.direction_queue = []
+        # the cell the tail left on the last move, None when the snake grew instead
+        self.vacated = None
+        # accepted inputs as (ticks, direction), and inputs a replay feeds back in
+        self.inputs = []
+        self.scheduled_inputs = {}
+        self.egg_positions = []
+        self.egg_types = {}
+        self.obstacles = []
+        self.moving_blocks = []
+        self.eggs_collected = 0
+        self.total_eggs_collected = 0
+        self.eggs_earned = 0
+        self.ticks = 0
+        self.dead = False
+        self.death_time = 0
+        self.death_cause = None
+        self.last_move_time = current_time
+        self.gained = 0
+        self.move_timer = self.timers.at(current_time + self.move_interval, self.next_move, priority=MOVE_PRIORITY)
+        self.moving_block_interval = self.rng.spawns.randint(1500, 3000)
+        self.spawn_timer = self.timers.at(current_time + self.moving_block_interval, self.next_spawn,
+                                          priority=SPAWN_PRIORITY)
+        self.generate_obstacles()
+        self.generate_eggs()
+
+    def mark_dirty(self, pos):
+        if self.track_dirty:
+            self.dirty_cells.add(pos)
+
+    def occupy(self, pos, flag):
+        self.grid.add(pos, flag)
+        self.free_cells.discard(pos)
+        self.mark_dirty(pos)
+
+    def release(self, pos, flag):
+        self.grid.remove(pos, flag)
+        self.mark_dirty(pos)
+        if not self.grid.has(pos, SNAKE | SPIKES | EGG):
+            self.free_cells.add(pos)
+
+    def generate_obstacles(self):
+        for pos in self.obstacles:
+            self.release(pos, SPIKES)
+        self.obstacles = []
+        self.layout_version += 1
+        for _ in range(10):
+            pos = self.free_cells.sample(self.rng.board)
+            if pos is None:
+                break
+            self.obstacles.append(pos)
+            self.occupy(pos, SPIKES)
+
+    def generate_eggs(self):
+        for pos in self.egg_positions:
+            self.release(pos, EGG)
+        self.egg_positions = []
+        self.egg_types = {}
+        for _ in range(5):
+            pos = self.free_cells.sample(self.rng.spawns)
+            if pos is None:
+                break
+            self.egg_positions.append(pos)
+            self.occupy(pos, EGG)
+            if self.rng.spawns.random() < (0.05 * self.upgrades["golden_egg_chance"]):
+                self.egg_types[pos] = "golden"
+            else:
+                self.egg_types[pos] = "normal"
+
+    def queue_direction(self, new_direction):
+        if len(self.direction_queue) >= 2 or self.dead:
+            return False
+        if new_direction[0] == -self.direction[0] and new_direction[1] == -self.direction[1]:
+            return False
+        future_direction = self.direction_queue[-1] if self.direction_queue else self.direction
+        if (new_direction[0] != -future_direction[0] or
+            new_direction[1] != -future_direction[1]):
+            self.direction_queue.append(new_direction)
+            self.inputs.append((self.ticks, new_direction))
+            return True
+        return False
+
+    def spawn_moving_block(self, current_time):
+        side = self.rng.spawns.choice(['top', 'right', 'bottom', 'left'])
+        if side in ('top', 'bottom'):
+            lane = [(x, CELL if side == 'top' else self.height - 2 * CELL)
+                    for x in range(CELL, self.width - 2 * CELL, CELL)]
+            direction = DOWN if side == 'top' else UP
+        else:
+            lane = [(CELL if side == 'left' else self.width - 2 * CELL, y)
+                    for y in range(CELL, self.height - 2 * CELL, CELL)]
+            direction = RIGHT if side == 'left' else LEFT
+
+        # any cell of the lane, snake or not, like the old spawner. the top and left lanes are inside
+        # the egg region, which is fine: blocks only touch the grid's block counts, never free_cells
+        pos = self.rng.spawns.choice(lane)
+        self.grid.add_block(pos)
+        self.mark_dirty(pos)
+        block = {
+            'pos': pos,
+            'direction': direction,
+            'previous': pos,
+            'last_move': current_time,
+            'move_interval': self.block_move_interval
+        }
+        block['timer'] = self.timers.every(block['move_interval'], self.move_block, block, priority=BLOCK_PRIORITY,
+                                           start=current_time + block['move_interval'])
+        self.moving_blocks.append(block)
+
+    def next_spawn(self):
+        self.moving_block_interval = self.rng.spawns.randint(1500, 3000)
+        self.spawn_timer = self.timers.after(self.moving_block_interval, self.next_spawn, priority=SPAWN_PRIORITY)
+        self.spawn_moving_block(self.timers.now)
+
+    def move_block(self, block):
+        block['last_move'] = self.timers.now
+        block['previous'] = block['pos']
+        new_x = block['pos'][0] + block['direction'][0]
+        new_y = block['pos'][1] + block['direction'][1]
+
+        self.grid.remove_block(block['pos'])
+        self.mark_dirty(block['pos'])
+        if (new_x < CELL or new_x >= self.width - CELL or
+            new_y < CELL or new_y >= self.height - CELL):
+            self.moving_blocks.remove(block)
+            self.timers.cancel(block['timer'])
+            return
+
+        block['pos'] = (new_x - (new_x % CELL), new_y - (new_y % CELL))
+        self.grid.add_block(block['pos'])
+        self.mark_dirty(block['pos'])
+
+    def collect_egg(self, pos):
+        egg_type = self.egg_types.pop(pos)
+        self.egg_positions.remove(pos)
+        self.release(pos, EGG)
+        multiplier = self.upgrades["currency_multiplier"]
+        if egg_type == "golden":
+            gained = 10 * multiplier
+            self.eggs_collected += 10
+        else:
+            gained = multiplier
+            self.eggs_collected += 1
+        self.total_eggs_collected += gained
+        self.eggs_earned += gained
+        return gained
+
+    def die(self, current_time, cause):
+        self.dead = True
+        self.death_time = current_time
+        self.death_cause = cause
+        # the board stops where it is
+        self.timers.clear()
+
+    def next_move(self):
+        self.move_timer = self.timers.after(self.move_interval, self.next_move, priority=MOVE_PRIORITY)
+        self.gained += self.move_snake(self.timers.now)
+
+    def move_snake(self, current_time):
+        if self.scheduled_inputs:
+            for direction in self.scheduled_inputs.pop(self.ticks, ()):
+                self.queue_direction(direction)
+        if self.controller is not None:
+            direction = self.controller(self)
+            if direction is not None:
+                self.queue_direction(direction)
+        self.last_move_time = current_time
+        self.ticks += 1
+
+        if self.direction_queue:
+            self.direction = self.direction_queue.pop(0)
+
+        new_x = self.snake[0][0] + self.direction[0]
+        new_y = self.snake[0][1] + self.direction[1]
+        new_head = (new_x - (new_x % CELL), new_y - (new_y % CELL))
+
+        if (new_x < CELL or new_x >= self.width - CELL or
+            new_y < CELL or new_y >= self.height - CELL):
+            self.die(current_time, "wall")
+            return 0
+        occupied = self.grid.has(new_head, BLOCK | SNAKE | SPIKES)
+        if occupied:
+            if occupied & BLOCK:
+                self.die(current_time, "moving_block")
+            elif occupied & SNAKE:
+                self.die(current_time, "self")
+            else:
+                self.die(current_time, "spikes")
+            return 0
+
+        self.snake.appendleft(new_head)
+        self.occupy(new_head, SNAKE)
+        if len(self.snake) > 1:
+            # the old head is drawn as body now
+            self.mark_dirty(self.snake[1])
+        gained = 0
+
+        if self.upgrades["egg_magnet"] != 0:
+            magnet_range = CELL * self.upgrades["egg_magnet"]
+            for egg in self.egg_positions[:]:
+                dx = egg[0] - new_head[0]
+                dy = egg[1] - new_head[1]
+                if dx * dx + dy * dy <= magnet_range * magnet_range:
+                    gained += self.collect_egg(egg)
+
+        if self.grid.has(new_head, EGG):
+            gained += self.collect_egg(new_head)
+
+        if len(self.egg_positions) == 0:
+            self.generate_eggs()
+        if self.eggs_collected >= self.upgrades["grow_rate"]:
+            self.eggs_collected = 0
+            self.vacated = None
+        else:
+            self.vacated = self.snake.pop()
+            self.release(self.vacated, SNAKE)
+        return gained
+
+    def update(self, current_time):
+        # advances the board by the time passed on the caller's clock, returns eggs gained
+        elapsed = current_time - self.clock
+        self.clock = current_time
+        return self.advance(self.time + elapsed * self.timers.scale)
+
+    def advance(self, board_time):
+        # moves run on a fixed 100ms grid and catch up after a slow frame, so the
+        # outcome only depends on which tick each input arrived before
+        self.gained = 0
+        self.timers.run_until(board_time)
+        self.time = self.timers.now
+        return self.gained
+
+    def resume(self, current_time):
+        # the board clock doesn't count a pause, so nothing gets caught up on
+        self.clock = current_time
+
+    def board_time(self, current_time):
+        return self.time + (current_time - self.clock) * self.timers.scale
+
+    def step(self):
+        # headless: jump straight to the next snake move
+        return self.advance(self.move_timer.time)
+
+    def run(self, max_ticks, policy=None):
+        while not self.dead and self.ticks < max_ticks:
+            if policy is not None:
+                new_direction = policy(self)
+                if new_direction is not None:
+                    self.queue_direction(new_direction)
+            self.step()
+        return self.ticks
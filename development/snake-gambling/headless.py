@@ -0,0 +1,95 @@
+import sys
+import time
+from core.simulation import Simulation, UP, DOWN, LEFT, RIGHT
+from core.grid import SNAKE, SPIKES, BLOCK
+
+TURNS = {UP: (LEFT, RIGHT), DOWN: (RIGHT, LEFT), LEFT: (DOWN, UP), RIGHT: (UP, DOWN)}
+
+
+def wander_policy(sim):
+    # turn away before hitting something, otherwise keep going
+    head = sim.snake[0]
+    options = (sim.direction,) + TURNS[sim.direction]
+    for direction in options:
+        x = head[0] + direction[0]
+        y = head[1] + direction[1]
+        if (20 <= x < sim.width - 20 and 20 <= y < sim.height - 20 and
+            not sim.grid.has((x, y), SNAKE | SPIKES | BLOCK)):
+            return None if direction == sim.direction else direction
+    return None
+
+
+def play(seed, policy=wander_policy, max_ticks=10000, upgrades=None):
+    sim = Simulation(seed=seed, upgrades=dict(upgrades) if upgrades is not None else None)
+    sim.run(max_ticks, policy)
+    return {
+        "seed": seed,
+        "ticks": sim.ticks,
+        "score": sim.total_eggs_collected,
+        "eggs": sim.eggs_earned,
+        "length": len(sim.snake),
+        "death_cause": sim.death_cause
+    }
+
+
+def run_games(games, max_ticks=10000, seed=0):
+    return [play(seed + game, wander_policy, max_ticks) for game in range(games)]
+
+
+def cycle_cells(sim):
+    # hamiltonian cycle over the playfield: serpentine rows, column 1 as the way back
+    cols = sim.width // 20 - 2
+    rows = sim.height // 20 - 2
+    cells = []
+    for row in range(rows):
+        xs = range(2, cols + 1) if row % 2 == 0 else range(cols, 1, -1)
+        cells.extend((x * 20, (row + 1) * 20) for x in xs)
+    cells.extend((20, (row + 1) * 20) for row in range(rows - 1, -1, -1))
+    return cells
+
+
+def benchmark_lengths(lengths=(1, 10, 100, 500, 1000, 2000), steps=5000):
+    results = []
+    for length in lengths:
+        sim = Simulation(seed=0)
+        sim.upgrades["grow_rate"] = 10 ** 9
+        sim.timers.cancel(sim.spawn_timer)
+        for pos in sim.obstacles:
+            sim.release(pos, SPIKES)
+        sim.obstacles = []
+        for pos in sim.snake:
+            sim.release(pos, SNAKE)
+
+        cells = cycle_cells(sim)
+        order = {pos: i for i, pos in enumerate(cells)}
+        head = length - 1
+        sim.snake = type(sim.snake)(cells[i] for i in range(head, head - length, -1))
+        for pos in sim.snake:
+            sim.occupy(pos, SNAKE)
+        sim.generate_eggs()
+
+        def follow_cycle(sim):
+            x, y = sim.snake[0]
+            nx, ny = cells[(order[(x, y)] + 1) % len(cells)]
+            return (nx - x, ny - y)
+
+        sim.direction = follow_cycle(sim)
+        start = time.perf_counter()
+        sim.run(steps, follow_cycle)
+        elapsed = time.perf_counter() - start
+        results.append((length, sim.ticks, elapsed / max(sim.ticks, 1) * 1e6))
+    return results
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        for length, ticks, step_us in benchmark_lengths():
+            print(f"length {length:5d}: {step_us:.2f} us/step over {ticks} steps")
+        sys.exit()
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    start = time.perf_counter()
+    results = run_games(games)
+    elapsed = time.perf_counter() - start
+    total_ticks = sum(r["ticks"] for r in results)
+    print(f"{games} games, {total_ticks} ticks in {elapsed:.2f}s ({total_ticks / elapsed:.0f} ticks/s)")
+    print(f"avg score: {sum(r['score'] for r in results) / games:.1f}")
@@ -1,13 +1,30 @@
 import pygame
 import sys
-import random
-import json
 import os
+import time
 from enum import Enum
+from itertools import islice
 from sites.shop import Shop
 from sites.gambling import Gambling
 from sites.settings import Settings
 from sites.button import Button
+from sites.text import render_text, text_cache
+from sites.assets import AssetManager
+from core.rng import RandomStreams
+from core.simulation import Simulation, UP, DOWN, LEFT, RIGHT, DEFAULT_UPGRADES
+from core.grid import SNAKE, EGG
+from core.profiler import FrameProfiler
+from core.replay import ReplayLog
+from core.save import SaveStore, SAVE_VERSION
+from core.journal import EggJournal
+from core.autopilot import Autopilot
+from core.scheduler import Scheduler
+
+MAX_REPLAYS = 20
+# the game clock advances in fixed steps, a frame adds at most MAX_FRAME_MS to it
+# so a hitch slows the game for a moment instead of jumping the snake ahead
+STEP_MS = 10
+MAX_FRAME_MS = 50
 
 class GameState(Enum):
     MENU = 1
@@ -18,6 +35,12 @@ class GameState(Enum):
     SETTINGS = 6
     TRANSITIONING = 7
 
+# asset groups a screen needs before it is shown
+SCREEN_ASSETS = {
+    GameState.GAMBLING: "gambling",
+    GameState.SETTINGS: "settings"
+}
+
 class SnakeGame:
     def __init__(self):
         pygame.init()
@@ -29,63 +52,98 @@ class SnakeGame:
         self.scale_y = self.display_height / self.height
         pygame.display.set_caption("Snake Game")
         self.clock = pygame.time.Clock()
+        self.game_time = 0
+        # screen-level timers on the game clock, the board keeps its own in sim.timers
+        self.timers = Scheduler()
+        self.accumulator = 0
         self.game_state = GameState.MENU
         self.previous_state = GameState.MENU
-        self.load_save_data()
-        self.upgrades = {
-            "grow_rate": 1,
-            "currency_multiplier": 1,
-            "egg_magnet": 0,
-            "golden_egg_chance": 0
-        }
+        self.rng = RandomStreams()
+        self.save_store = SaveStore('save_data.json')
+        self.journal = EggJournal('egg_journal.bin')
+        self.eggs = 0
+        # only the board sprites block startup, the other screens decode in the background
+        self.asset_manager = AssetManager().load(["game"])
+        self.asset_manager.prefetch(SCREEN_ASSETS.values())
+        print(self.asset_manager.report())
+        self.upgrades = dict(DEFAULT_UPGRADES)
         self.snake_skin = "default"
         self.owned_skins = {"default"}
         self.shop = Shop(self)
         self.gambling = Gambling(self)
         self.settings = Settings(self)
         self.debug_mode = False
+        self.profiler = FrameProfiler(60)
+        self.profiler_overlay = None
+        self.profiler_overlay_time = 0
         self.use_arrow_keys = False
         self.setup_buttons()
         self.load_assets()
-        self.reset_game()
-        self.direction_queue = []
-        self.last_move_time = pygame.time.get_ticks()
-        self.move_interval = 100
-        self.moving_blocks = []
-        self.last_moving_block_time = pygame.time.get_ticks()
-        self.moving_block_interval = random.randint(1500, 3000)
-        self.eggs_collected = 0
-        self.total_eggs_collected = 0
+        self.sim = Simulation(self.width, self.height, self.upgrades)
+        self.sim_paused = False
+        self.replay = None
+        self.replay_saved = True
+        self.autopilot = None
+        self.last_replay = None
+        self.playfield_surface = None
+        self.playfield_key = None
+        self.hud = None
+        self.hud_key = None
+        self.dirty_rendering = True
+        self.sim.track_dirty = True
+        self.dirty_base_key = None
+        self.dirty_hud = None
+        self.dirty_hud_rects = []
+        self.moving_cells = set()
         self.showing_death_summary = False
-        self.death_summary_time = 0
+        self.death_timer = None
+        self.load_save_data()
+        self.reset_game()
         self.death_menu_button = Button(self.width//2 - 100, self.height//2 + 100, 200, 50, "Main Menu", self)
         
         self.transition_alpha = 0
-        self.transition_speed = 0.1
+        self.transition_duration = 170
+        self.transition_started = 0
+        self.transition_timer = None
         self.transition_surface = pygame.Surface((self.display_width, self.display_height))
         self.transition_surface.fill((0, 0, 0))
         self.transition_target = None
         self.transition_start = None
 
     def load_save_data(self):
-        self.eggs = 0
-        if os.path.exists('save_data.json'):
-            try:
-                with open('save_data.json', 'r') as f:
-                    data = json.load(f)
-                    self.eggs = data.get('eggs', 0)
-            except Exception as e:
-                print(f"Error loading save data: {e}")
-
-    def save_data(self):
-        try:
-            data = {
-                'eggs': self.eggs
+        data = self.save_store.load()
+        # the journal is appended on every change, so it is ahead of the debounced save after a crash
+        self.eggs = self.journal.open(data['eggs'])
+        for item_id, level in data['upgrades'].items():
+            self.shop.set_level(item_id, level)
+        self.owned_skins = set(data['owned_skins'])
+        self.snake_skin = data['snake_skin'] if data['snake_skin'] in self.owned_skins else "default"
+        self.use_arrow_keys = data['settings']['use_arrow_keys']
+        self.dirty_rendering = data['settings']['dirty_rendering']
+        self.sim.track_dirty = self.dirty_rendering
+
+    def save_state(self):
+        return {
+            'version': SAVE_VERSION,
+            'eggs': self.eggs,
+            'upgrades': dict(self.upgrades),
+            'owned_skins': sorted(self.owned_skins),
+            'snake_skin': self.snake_skin,
+            'settings': {
+                'use_arrow_keys': self.use_arrow_keys,
+                'dirty_rendering': self.dirty_rendering
             }
-            with open('save_data.json', 'w') as f:
-                json.dump(data, f)
-        except Exception as e:
-            print(f"Error saving data: {e}")
+        }
+
+    def change_eggs(self, delta, source):
+        self.eggs += delta
+        self.journal.record(source, delta, self.eggs)
+
+    def save_data(self, immediate=False):
+        if immediate:
+            self.save_store.flush(self.save_state())
+        else:
+            self.save_store.save(self.save_state())
 
     def setup_buttons(self):
         button_width = 200
@@ -129,74 +187,115 @@ class SnakeGame:
         )
 
     def reset_game(self):
-        self.snake = [(self.width//2 - (self.width//2 % 20), self.height//2 - (self.height//2 % 20))]
-        self.direction = (20, 0)
-        self.direction_queue = []
-        self.egg_positions = []
-        self.obstacles = []
-        self.moving_blocks = []
-        self.eggs_collected = 0
-        self.total_eggs_collected = 0
-        self.generate_obstacles()
-        self.generate_eggs()
-
-    def generate_obstacles(self):
-        self.obstacles = []
-        for _ in range(10):
-            while True:
-                x = random.randrange(20, self.width - 40, 20)
-                y = random.randrange(20, self.height - 40, 20)
-                pos = (x - (x % 20), y - (y % 20))
-                if pos not in self.obstacles and pos not in self.snake:
-                    self.obstacles.append(pos)
-                    break
-
-    def generate_eggs(self):
-        self.egg_positions = []
-        self.egg_types = {}  # Dictionary to store egg types (normal or golden)
-        for _ in range(5):
-            while True:
-                x = random.randrange(20, self.width - 40, 20)
-                y = random.randrange(20, self.height - 40, 20)
-                pos = (x - (x % 20), y - (y % 20))
-                if pos not in self.obstacles and pos not in self.snake and pos not in self.egg_positions:
-                    self.egg_positions.append(pos)
-                    # Determine if this egg is golden
-                    if random.random() < (0.05 * self.upgrades["golden_egg_chance"]):
-                        self.egg_types[pos] = "golden"
-                    else:
-                        self.egg_types[pos] = "normal"
-                    break
+        self.save_replay()
+        self.replay = None
+        # a new round must not be closed by the last one's death summary
+        self.timers.cancel(self.death_timer)
+        self.death_timer = None
+        self.sim.upgrades = self.upgrades
+        # every round gets its own board seed so the input log alone can replay it
+        self.sim.reset(self.game_time, self.rng.rounds.randrange(1 << 53))
+        self.replay_saved = False
+
+    def save_replay(self):
+        # keeps the round that just ended, playbacks aren't recorded again
+        if self.replay is not None or self.replay_saved or self.sim.ticks == 0:
+            return
+        self.replay_saved = True
+        self.last_replay = ReplayLog.from_simulation(self.sim)
+        try:
+            self.last_replay.save(os.path.join('replays', f"replay_{int(time.time())}_{self.sim.rng.seed:x}.snkr"))
+            for name in sorted(os.listdir('replays'))[:-MAX_REPLAYS]:
+                os.remove(os.path.join('replays', name))
+        except Exception as e:
+            print(f"Error saving replay: {e}")
+
+    def load_last_replay(self):
+        if self.last_replay is None and os.path.isdir('replays'):
+            names = sorted(os.listdir('replays'))
+            if names:
+                try:
+                    self.last_replay = ReplayLog.load(os.path.join('replays', names[-1]))
+                except Exception as e:
+                    print(f"Error loading replay: {e}")
+        return self.last_replay
+
+    def start_replay(self, log):
+        if self.autopilot is not None:
+            self.toggle_autopilot()
+        self.reset_game()
+        self.replay = log
+        log.start(self.sim, self.game_time)
+        self.showing_death_summary = False
+        self.start_transition(GameState.PLAYING)
+
+    def toggle_autopilot(self):
+        # demo / AFK mode, it steers through sim.controller and its rounds don't pay out eggs
+        if self.autopilot is None:
+            self.autopilot = Autopilot(self.sim)
+            self.sim.controller = self.run_autopilot
+        else:
+            self.autopilot = None
+            self.sim.controller = None
+
+    def run_autopilot(self, sim):
+        with self.profiler.section("autopilot"):
+            return self.autopilot.choose(sim)
 
     def start_transition(self, target_state):
         self.transition_start = self.game_state
         self.transition_target = target_state
         self.game_state = GameState.TRANSITIONING
         self.transition_alpha = 0
+        self.transition_started = self.game_time
+        self.timers.cancel(self.transition_timer)
+        self.transition_timer = self.timers.after(self.transition_duration, self.finish_transition)
+        if target_state in SCREEN_ASSETS:
+            self.asset_manager.prefetch([SCREEN_ASSETS[target_state]])
 
-    def update_transition(self):
-        if self.game_state == GameState.TRANSITIONING:
-            self.transition_alpha += self.transition_speed
-            if self.transition_alpha >= 1:
-                self.transition_alpha = 1
-                self.game_state = self.transition_target
-                self.transition_alpha = 0
-                self.transition_target = None
-                self.transition_start = None
+    def finish_transition(self):
+        # the screen is black here, so whatever is left to load doesn't show
+        if self.transition_target in SCREEN_ASSETS:
+            self.asset_manager.require(SCREEN_ASSETS[self.transition_target])
+        self.game_state = self.transition_target
+        self.transition_alpha = 0
+        self.transition_target = None
+        self.transition_start = None
+        self.transition_timer = None
+
+    def close_death_summary(self):
+        self.showing_death_summary = False
+        self.reset_game()
+        self.start_transition(GameState.MENU)
 
     def draw_transition(self):
         if self.game_state == GameState.TRANSITIONING:
+            elapsed = self.game_time + self.accumulator - self.transition_started
+            self.transition_alpha = min(1, elapsed / self.transition_duration)
             self.transition_surface.set_alpha(int(self.transition_alpha * 255))
             self.screen.blit(self.transition_surface, (0, 0))
 
     def handle_input(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                self.save_data()
+                self.save_data(immediate=True)
+                self.journal.close()
                 pygame.quit()
                 sys.exit()
             
             if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_F9 and self.debug_mode:
+                    path = self.profiler.dump(f"profile_trace_{int(time.time())}.csv")
+                    print(f"Profiler trace written to {path}")
+                
+                if event.key == pygame.K_F2 and self.game_state == GameState.PLAYING and self.replay is None:
+                    self.toggle_autopilot()
+                
+                if event.key == pygame.K_F5 and self.game_state == GameState.MENU:
+                    log = self.load_last_replay()
+                    if log is not None:
+                        self.start_replay(log)
+                
                 if event.key == pygame.K_ESCAPE:
                     if self.game_state == GameState.PLAYING:
                         self.previous_state = self.game_state
@@ -212,33 +311,14 @@ class SnakeGame:
                         self.gambling.current_game = None
                         self.save_data()
                 
-                if self.game_state == GameState.PLAYING and not self.showing_death_summary:
-                    if len(self.direction_queue) < 2:
-                        new_direction = None
-                        if self.use_arrow_keys:
-                            if event.key == pygame.K_UP and self.direction != (0, 20):
-                                new_direction = (0, -20)
-                            elif event.key == pygame.K_DOWN and self.direction != (0, -20):
-                                new_direction = (0, 20)
-                            elif event.key == pygame.K_LEFT and self.direction != (20, 0):
-                                new_direction = (-20, 0)
-                            elif event.key == pygame.K_RIGHT and self.direction != (-20, 0):
-                                new_direction = (20, 0)
-                        else:
-                            if event.key == pygame.K_w and self.direction != (0, 20):
-                                new_direction = (0, -20)
-                            elif event.key == pygame.K_s and self.direction != (0, -20):
-                                new_direction = (0, 20)
-                            elif event.key == pygame.K_a and self.direction != (20, 0):
-                                new_direction = (-20, 0)
-                            elif event.key == pygame.K_d and self.direction != (-20, 0):
-                                new_direction = (20, 0)
-                        
-                        if new_direction is not None:
-                            future_direction = self.direction_queue[-1] if self.direction_queue else self.direction
-                            if (new_direction[0] != -future_direction[0] or 
-                                new_direction[1] != -future_direction[1]):
-                                self.direction_queue.append(new_direction)
+                if (self.game_state == GameState.PLAYING and not self.showing_death_summary
+                        and self.replay is None and self.autopilot is None):
+                    if self.use_arrow_keys:
+                        key_directions = {pygame.K_UP: UP, pygame.K_DOWN: DOWN, pygame.K_LEFT: LEFT, pygame.K_RIGHT: RIGHT}
+                    else:
+                        key_directions = {pygame.K_w: UP, pygame.K_s: DOWN, pygame.K_a: LEFT, pygame.K_d: RIGHT}
+                    if event.key in key_directions:
+                        self.sim.queue_direction(key_directions[event.key])
 
             if event.type == pygame.MOUSEMOTION:
                 if self.game_state == GameState.MENU:
@@ -260,9 +340,12 @@ class SnakeGame:
                 if self.game_state == GameState.MENU:
                     if self.debug_button.handle_event(event):
                         self.debug_mode = not self.debug_mode
+                        self.profiler.enabled = self.debug_mode
+                        self.profiler.reset()
                         return
                     if self.exit_button.handle_event(event):
-                        self.save_data()
+                        self.save_data(immediate=True)
+                        self.journal.close()
                         pygame.quit()
                         sys.exit()
                     
@@ -303,40 +386,252 @@ class SnakeGame:
                     self.gambling.handle_input(event)
                 elif self.game_state == GameState.PLAYING and self.showing_death_summary:
                     if self.death_menu_button.handle_event(event):
-                        self.showing_death_summary = False
-                        self.reset_game()
-                        self.start_transition(GameState.MENU)
+                        self.close_death_summary()
 
     def load_assets(self):
+        get = self.asset_manager.get
         self.assets = {
-            "wall": pygame.image.load("assets/wall_block.png").convert_alpha(),
-            "spikes": pygame.image.load("assets/spikes.png").convert_alpha(),
-            "egg": pygame.image.load("assets/egg.png").convert_alpha(),
-            "golden_egg": pygame.image.load("assets/golden_egg.png").convert_alpha(),
+            "wall": get("wall"),
+            "spikes": get("spikes"),
+            "egg": get("egg"),
+            "golden_egg": get("golden_egg"),
             "snake": {
                 "head": {
-                    "up": pygame.image.load("assets/snake_head_up.png").convert_alpha(),
-                    "down": pygame.image.load("assets/snake_head_down.png").convert_alpha(),
-                    "left": pygame.image.load("assets/snake_head_left.png").convert_alpha(),
-                    "right": pygame.image.load("assets/snake_head_right.png").convert_alpha()
+                    "up": get("snake_head_up"),
+                    "down": get("snake_head_down"),
+                    "left": get("snake_head_left"),
+                    "right": get("snake_head_right")
                 },
-                "body": pygame.image.load("assets/snake_body.png").convert_alpha(),
-                "tail": {
-                    "up": pygame.image.load("assets/snake_head_up.png").convert_alpha(),
-                    "down": pygame.image.load("assets/snake_head_down.png").convert_alpha(),
-                    "left": pygame.image.load("assets/snake_head_left.png").convert_alpha(),
-                    "right": pygame.image.load("assets/snake_head_right.png").convert_alpha()
-                }
+                "body": get("snake_body")
             }
         }
 
+    def get_playfield(self):
+        key = (self.display_width, self.display_height, self.sim.layout_version)
+        if self.playfield_key == key:
+            return self.playfield_surface
+        
+        surface = pygame.Surface((self.width, self.height)).convert()
+        surface.fill((20, 20, 20))
+        
+        # grid lines
+        for x in range(0, self.width, 20):
+            pygame.draw.line(surface, (30, 30, 30), (x, 0), (x, self.height))
+        for y in range(0, self.height, 20):
+            pygame.draw.line(surface, (30, 30, 30), (0, y), (self.width, y))
+        
+        # walls
+        for x in range(0, self.width, 20):
+            for y in range(0, self.height, 20):
+                if x == 0 or x == self.width - 20 or y == 0 or y == self.height - 20:
+                    surface.blit(self.assets["wall"], (x, y))
+        
+        # obstacles
+        for obstacle in self.sim.obstacles:
+            surface.blit(self.assets["spikes"], obstacle)
+        
+        self.playfield_surface = surface
+        self.playfield_key = key
+        return surface
+
+    def get_head_image(self):
+        if self.sim.direction == (0, -20):
+            return self.assets["snake"]["head"]["up"]
+        elif self.sim.direction == (0, 20):
+            return self.assets["snake"]["head"]["down"]
+        elif self.sim.direction == (-20, 0):
+            return self.assets["snake"]["head"]["left"]
+        return self.assets["snake"]["head"]["right"]
+
+    def move_progress(self, since):
+        # rendering runs one snake move behind the board, so sprites slide into the cell they are in now
+        if self.sim.dead:
+            return 1
+        render_time = self.sim.board_time(self.game_time + self.accumulator)
+        return min(1, max(0, (render_time - since) / self.sim.move_interval))
+
+    def moving_sprites(self):
+        # head, tail and blocks between their last two cells, the body in between holds still
+        sim = self.sim
+        snake = sim.snake
+        alpha = self.move_progress(sim.last_move_time)
+        sprites = []
+        if len(snake) > 1:
+            tail_from = sim.vacated or snake[-1]
+            sprites.append((self.assets["snake"]["body"], tail_from, snake[-1], alpha))
+            head_from = snake[1]
+        else:
+            head_from = sim.vacated or snake[0]
+        sprites.append((self.get_head_image(), head_from, snake[0], alpha))
+        for block in sim.moving_blocks:
+            sprites.append((self.assets["spikes"], block['previous'], block['pos'], self.move_progress(block['last_move'])))
+        return sprites
+
+    def draw_moving_sprites(self, sprites, play_area_x, play_area_y):
+        for image, start, end, alpha in sprites:
+            x = start[0] + (end[0] - start[0]) * alpha
+            y = start[1] + (end[1] - start[1]) * alpha
+            self.screen.blit(image, (play_area_x + round(x), play_area_y + round(y)))
+
+    def draw_board_sprites(self, play_area_x, play_area_y, sprites=None):
+        # snake body, the head and the bit of tail still leaving its old cell are drawn with the moving sprites
+        body = self.assets["snake"]["body"]
+        for segment in islice(self.sim.snake, 1, None):
+            self.screen.blit(body, (play_area_x + segment[0], play_area_y + segment[1]))
+        
+        # eggs
+        for egg in self.sim.egg_positions:
+            if self.sim.egg_types.get(egg) == "golden":
+                self.screen.blit(self.assets["golden_egg"], (play_area_x + egg[0], play_area_y + egg[1]))
+            else:
+                self.screen.blit(self.assets["egg"], (play_area_x + egg[0], play_area_y + egg[1]))
+        
+        self.draw_moving_sprites(sprites or self.moving_sprites(), play_area_x, play_area_y)
+
+    def draw_cell(self, pos, play_area_x, play_area_y):
+        rect = pygame.Rect(play_area_x + pos[0], play_area_y + pos[1], 20, 20)
+        self.screen.blit(self.get_playfield(), rect, pygame.Rect(pos[0], pos[1], 20, 20))
+        # only what holds still, the moving sprites go on top afterwards
+        flags = self.sim.grid.has(pos, SNAKE | EGG)
+        if flags & SNAKE and pos != self.sim.snake[0]:
+            self.screen.blit(self.assets["snake"]["body"], rect)
+        if flags & EGG:
+            if self.sim.egg_types.get(pos) == "golden":
+                self.screen.blit(self.assets["golden_egg"], rect)
+            else:
+                self.screen.blit(self.assets["egg"], rect)
+        return rect
+
+    def get_hud(self):
+        magnet_range = 20 * self.upgrades["egg_magnet"] if self.upgrades["egg_magnet"] != 0 else 0
+        golden_chance = 5 * self.upgrades["golden_egg_chance"]
+        key = (len(self.sim.snake), self.sim.total_eggs_collected, self.debug_mode, magnet_range, golden_chance,
+               self.display_width, self.display_height)
+        if self.hud_key == key:
+            return self.hud
+        
+        font_size = int(36 * min(self.scale_x, self.scale_y))
+        
+        length_text = render_text(f"Length: {len(self.sim.snake)}", font_size, (255, 255, 255))
+        score_text = render_text(f"Score: {self.sim.total_eggs_collected}", font_size, (255, 255, 255))
+        
+        panel_width = max(length_text.get_width(), score_text.get_width()) + int(40 * self.scale_x)
+        panel_height = int(80 * self.scale_y)
+        
+        panel_x = int(10 * self.scale_x)
+        panel_y = int(10 * self.scale_y)
+        panel_surface = pygame.Surface((panel_width, panel_height), pygame.SRCALPHA)
+        pygame.draw.rect(panel_surface, (30, 30, 30, 180), panel_surface.get_rect(), border_radius=int(10 * min(self.scale_x, self.scale_y)))
+        pygame.draw.rect(panel_surface, (60, 60, 60, 180), panel_surface.get_rect(), int(2 * min(self.scale_x, self.scale_y)), border_radius=int(10 * min(self.scale_x, self.scale_y)))
+        
+        length_shadow = render_text(f"Length: {len(self.sim.snake)}", font_size, (0, 0, 0))
+        score_shadow = render_text(f"Score: {self.sim.total_eggs_collected}", font_size, (0, 0, 0))
+        
+        text_x = int(20 * self.scale_x) - panel_x
+        panel_surface.blit(length_shadow, (text_x + 2, int(22 * self.scale_y) - panel_y))
+        panel_surface.blit(score_shadow, (text_x + 2, int(57 * self.scale_y) - panel_y))
+        
+        panel_surface.blit(length_text, (text_x, int(20 * self.scale_y) - panel_y))
+        panel_surface.blit(score_text, (text_x, int(55 * self.scale_y) - panel_y))
+        hud = [(panel_surface, (panel_x, panel_y))]
+
+        if self.debug_mode:
+            debug_size = int(24 * min(self.scale_x, self.scale_y))
+            debug_text = render_text(f"Magnet Range: {magnet_range}px | Golden Chance: {golden_chance}%", debug_size, (255, 255, 255))
+            debug_rect = debug_text.get_rect(topright=(self.display_width - int(20 * self.scale_x), int(20 * self.scale_y)))
+            hud.append((debug_text, debug_rect.topleft))
+        
+        self.hud = hud
+        self.hud_key = key
+        return hud
+
+    def draw_playing_dirty(self):
+        play_area_x = (self.display_width - self.width) // 2
+        play_area_y = (self.display_height - self.height) // 2
+        playfield = self.get_playfield()
+        if self.dirty_base_key != self.playfield_key:
+            return False
+        
+        # the cells under the moving sprites, this frame and the last
+        sprites = self.moving_sprites()
+        moving_cells = {cell for sprite in sprites for cell in sprite[1:3]}
+        cells = self.sim.dirty_cells | moving_cells | self.moving_cells
+        self.moving_cells = moving_cells
+        rects = [self.draw_cell(pos, play_area_x, play_area_y) for pos in cells]
+        self.sim.dirty_cells.clear()
+        self.draw_moving_sprites(sprites, play_area_x, play_area_y)
+        
+        # the hud is translucent, so everything under it is redrawn when it changes or gets drawn over
+        old_hud_rects = self.dirty_hud_rects
+        hud = self.get_hud()
+        hud_rects = [surface.get_rect(topleft=pos) for surface, pos in hud]
+        if hud is not self.dirty_hud or any(rect.collidelist(hud_rects) != -1 for rect in rects):
+            for rect in old_hud_rects + hud_rects:
+                self.screen.set_clip(rect)
+                self.screen.fill((20, 20, 20))
+                self.screen.blit(playfield, (play_area_x, play_area_y))
+                self.draw_board_sprites(play_area_x, play_area_y, sprites)
+                self.screen.set_clip(None)
+            for surface, pos in hud:
+                self.screen.blit(surface, pos)
+            rects.extend(old_hud_rects + hud_rects)
+            self.dirty_hud = hud
+            self.dirty_hud_rects = hud_rects
+        
+        if self.debug_mode:
+            rects.append(self.draw_profiler_overlay())
+        
+        if rects:
+            pygame.display.update(rects)
+        return True
+
+    def draw_profiler_overlay(self):
+        # opaque and fixed size, so the dirty renderer can just draw it on top every frame
+        now = pygame.time.get_ticks()
+        if self.profiler_overlay is None or now - self.profiler_overlay_time >= 250:
+            self.profiler_overlay_time = now
+            line_size = int(20 * min(self.scale_x, self.scale_y))
+            line_height = int(18 * self.scale_y)
+            names = ["frame", "handle_input", "update", "draw", "autopilot", "gambling.update",
+                     "shop.draw", "gambling.draw", "settings.draw"]
+            lines = ["section           p50    p95    p99 (ms)"]
+            for name in names:
+                stats = self.profiler.stats(name)
+                lines.append(f"{name:<16}{stats['p50']:6.2f} {stats['p95']:6.2f} {stats['p99']:6.2f}")
+            lines.append(f"dropped: {self.profiler.dropped_frames}  over budget: {self.profiler.over_budget_frames}  frames: {self.profiler.frames}")
+            lines.append(f"text cache: {text_cache.hits} hits / {text_cache.misses} misses  (F9: dump trace)")
+            # always two lines so the overlay keeps its size for the dirty renderer
+            stats = self.autopilot.stats() if self.autopilot is not None else {}
+            if stats:
+                lines.append(f"autopilot: {stats['mean_ms']:.2f} mean {stats['p99_ms']:.2f} p99 {stats['max_ms']:.2f} max (ms)")
+                lines.append(f"  {stats['decisions']} decisions, {stats['fallbacks']} fallbacks, {stats['rebuilds']} rebuilds")
+            else:
+                lines.extend(["autopilot: off (F2 while playing)", ""])
+            
+            surface = pygame.Surface((int(420 * self.scale_x), line_height * len(lines) + int(10 * self.scale_y))).convert()
+            surface.fill((10, 10, 10))
+            font = text_cache.get_font(line_size)
+            for i, line in enumerate(lines):
+                # rendered directly, these change every refresh and would only churn the text cache
+                surface.blit(font.render(line, True, (200, 255, 200)), (int(5 * self.scale_x), int(5 * self.scale_y) + i * line_height))
+            self.profiler_overlay = surface
+        
+        rect = self.profiler_overlay.get_rect(bottomleft=(int(10 * self.scale_x), self.display_height - int(10 * self.scale_y)))
+        self.screen.blit(self.profiler_overlay, rect)
+        return rect
+
     def draw(self):
+        if (self.game_state == GameState.PLAYING and self.dirty_rendering
+                and not self.showing_death_summary and self.draw_playing_dirty()):
+            return
+        
         self.screen.fill((20, 20, 20))
+        self.dirty_base_key = None
         
         if self.game_state == GameState.MENU:
-            title_font = pygame.font.Font(None, int(74 * min(self.scale_x, self.scale_y)))
-            title_shadow = title_font.render("Snake Game", True, (0, 0, 0))
-            title_text = title_font.render("Snake Game", True, (255, 255, 255))
+            title_size = int(74 * min(self.scale_x, self.scale_y))
+            title_shadow = render_text("Snake Game", title_size, (0, 0, 0))
+            title_text = render_text("Snake Game", title_size, (255, 255, 255))
             title_rect = title_text.get_rect(center=(self.display_width//2, int(200 * self.scale_y)))
             self.screen.blit(title_shadow, (title_rect.x + 2, title_rect.y + 2))
             self.screen.blit(title_text, title_rect)
@@ -353,119 +648,53 @@ class SnakeGame:
             play_area_x = (self.display_width - self.width) // 2
             play_area_y = (self.display_height - self.height) // 2
             
-            # grid lines
-            for x in range(0, self.width, 20):
-                scaled_x = play_area_x + x
-                pygame.draw.line(self.screen, (30, 30, 30), (scaled_x, play_area_y), (scaled_x, play_area_y + self.height))
-            for y in range(0, self.height, 20):
-                scaled_y = play_area_y + y
-                pygame.draw.line(self.screen, (30, 30, 30), (play_area_x, scaled_y), (play_area_x + self.width, scaled_y))
-            
-            # walls
-            wall_size = 20
-            for x in range(0, self.width, 20):
-                for y in range(0, self.height, 20):
-                    if x == 0 or x == self.width - 20 or y == 0 or y == self.height - 20:
-                        self.screen.blit(self.assets["wall"], (play_area_x + x, play_area_y + y))
-            
-            # snake
-            for i, segment in enumerate(self.snake):
-                if i == 0:  # Head
-                    if self.direction == (0, -20):
-                        head_img = self.assets["snake"]["head"]["up"]
-                    elif self.direction == (0, 20):
-                        head_img = self.assets["snake"]["head"]["down"]
-                    elif self.direction == (-20, 0):
-                        head_img = self.assets["snake"]["head"]["left"]
-                    else:
-                        head_img = self.assets["snake"]["head"]["right"]
-                    self.screen.blit(head_img, (play_area_x + segment[0], play_area_y + segment[1]))
-                else:  # Body and Tail
-                    self.screen.blit(self.assets["snake"]["body"], (play_area_x + segment[0], play_area_y + segment[1]))
-            
-            # eggs
-            for egg in self.egg_positions:
-                if self.egg_types.get(egg) == "golden":
-                    self.screen.blit(self.assets["golden_egg"], (play_area_x + egg[0], play_area_y + egg[1]))
-                else:
-                    self.screen.blit(self.assets["egg"], (play_area_x + egg[0], play_area_y + egg[1]))
+            # grid, walls and spikes
+            self.screen.blit(self.get_playfield(), (play_area_x, play_area_y))
             
-            # obstacles
-            for obstacle in self.obstacles:
-                self.screen.blit(self.assets["spikes"], (play_area_x + obstacle[0], play_area_y + obstacle[1]))
-            
-            # moving blocks
-            for block in self.moving_blocks:
-                self.screen.blit(self.assets["spikes"], (play_area_x + block['pos'][0], play_area_y + block['pos'][1]))
+            sprites = self.moving_sprites()
+            self.draw_board_sprites(play_area_x, play_area_y, sprites)
             
             # UI
-            font = pygame.font.Font(None, int(36 * min(self.scale_x, self.scale_y)))
-            
-            length_text = font.render(f"Length: {len(self.snake)}", True, (255, 255, 255))
-            score_text = font.render(f"Score: {self.total_eggs_collected}", True, (255, 255, 255))
-            
-            panel_width = max(length_text.get_width(), score_text.get_width()) + int(40 * self.scale_x)
-            panel_height = int(80 * self.scale_y)
-            
-            panel_rect = pygame.Rect(int(10 * self.scale_x), int(10 * self.scale_y), panel_width, panel_height)
-            panel_surface = pygame.Surface((panel_width, panel_height), pygame.SRCALPHA)
-            pygame.draw.rect(panel_surface, (30, 30, 30, 180), panel_surface.get_rect(), border_radius=int(10 * min(self.scale_x, self.scale_y)))
-            pygame.draw.rect(panel_surface, (60, 60, 60, 180), panel_surface.get_rect(), int(2 * min(self.scale_x, self.scale_y)), border_radius=int(10 * min(self.scale_x, self.scale_y)))
-            self.screen.blit(panel_surface, panel_rect)
-            
-            length_shadow = font.render(f"Length: {len(self.snake)}", True, (0, 0, 0))
-            score_shadow = font.render(f"Score: {self.total_eggs_collected}", True, (0, 0, 0))
+            hud = self.get_hud()
+            for surface, pos in hud:
+                self.screen.blit(surface, pos)
             
-            text_x = int(20 * self.scale_x)
-            self.screen.blit(length_shadow, (text_x + 2, int(22 * self.scale_y)))
-            self.screen.blit(score_shadow, (text_x + 2, int(57 * self.scale_y)))
-            
-            self.screen.blit(length_text, (text_x, int(20 * self.scale_y)))
-            self.screen.blit(score_text, (text_x, int(55 * self.scale_y)))
-
-            if self.debug_mode:
-                debug_font = pygame.font.Font(None, int(24 * min(self.scale_x, self.scale_y)))
-                magnet_range = 20 * self.upgrades["egg_magnet"] if self.upgrades["egg_magnet"] != 0 else 0
-                golden_chance = 5 * self.upgrades["golden_egg_chance"]
-                debug_text = debug_font.render(f"Magnet Range: {magnet_range}px | Golden Chance: {golden_chance}%", True, (255, 255, 255))
-                debug_rect = debug_text.get_rect(topright=(self.display_width - int(20 * self.scale_x), int(20 * self.scale_y)))
-                self.screen.blit(debug_text, debug_rect)
+            if self.dirty_rendering and not self.showing_death_summary:
+                self.sim.dirty_cells.clear()
+                self.moving_cells = {cell for sprite in sprites for cell in sprite[1:3]}
+                self.dirty_base_key = self.playfield_key
+                self.dirty_hud = hud
+                self.dirty_hud_rects = [surface.get_rect(topleft=pos) for surface, pos in hud]
 
             if self.showing_death_summary:
-                current_time = pygame.time.get_ticks()
-                if current_time - self.death_summary_time < 4000:
-                    summary_width = int(400 * self.scale_x)
-                    summary_height = int(300 * self.scale_y)
-                    summary_x = (self.display_width - summary_width) // 2
-                    summary_y = (self.display_height - summary_height) // 2
-
-                    summary_surface = pygame.Surface((summary_width, summary_height), pygame.SRCALPHA)
-                    pygame.draw.rect(summary_surface, (30, 30, 30, 230), summary_surface.get_rect(), border_radius=int(15 * min(self.scale_x, self.scale_y)))
-                    pygame.draw.rect(summary_surface, (60, 60, 60, 230), summary_surface.get_rect(), int(2 * min(self.scale_x, self.scale_y)), border_radius=int(15 * min(self.scale_x, self.scale_y)))
-                    self.screen.blit(summary_surface, (summary_x, summary_y))
-
-                    title_font = pygame.font.Font(None, int(48 * min(self.scale_x, self.scale_y)))
-                    title_text = title_font.render("Game Over!", True, (255, 255, 255))
-                    title_rect = title_text.get_rect(center=(summary_x + summary_width//2, summary_y + int(50 * self.scale_y)))
-                    self.screen.blit(title_text, title_rect)
-
-                    stats_font = pygame.font.Font(None, int(36 * min(self.scale_x, self.scale_y)))
-                    stats = [
-                        f"Length: {len(self.snake)}",
-                        f"Score: {self.total_eggs_collected}",
-                        f"Eggs Collected: {self.total_eggs_collected}"
-                    ]
-
-                    for i, stat in enumerate(stats):
-                        stat_text = stats_font.render(stat, True, (255, 255, 255))
-                        stat_rect = stat_text.get_rect(center=(summary_x + summary_width//2, summary_y + int(120 + i * 40) * self.scale_y))
-                        self.screen.blit(stat_text, stat_rect)
-
-                    self.death_menu_button.draw(self.screen)
-                else:
-                    self.showing_death_summary = False
-                    self.reset_game()
-                    self.start_transition(GameState.MENU)
+                summary_width = int(400 * self.scale_x)
+                summary_height = int(300 * self.scale_y)
+                summary_x = (self.display_width - summary_width) // 2
+                summary_y = (self.display_height - summary_height) // 2
+
+                summary_surface = pygame.Surface((summary_width, summary_height), pygame.SRCALPHA)
+                pygame.draw.rect(summary_surface, (30, 30, 30, 230), summary_surface.get_rect(), border_radius=int(15 * min(self.scale_x, self.scale_y)))
+                pygame.draw.rect(summary_surface, (60, 60, 60, 230), summary_surface.get_rect(), int(2 * min(self.scale_x, self.scale_y)), border_radius=int(15 * min(self.scale_x, self.scale_y)))
+                self.screen.blit(summary_surface, (summary_x, summary_y))
+
+                title_size = int(48 * min(self.scale_x, self.scale_y))
+                title_text = render_text("Game Over!", title_size, (255, 255, 255))
+                title_rect = title_text.get_rect(center=(summary_x + summary_width//2, summary_y + int(50 * self.scale_y)))
+                self.screen.blit(title_text, title_rect)
+
+                stats_size = int(36 * min(self.scale_x, self.scale_y))
+                stats = [
+                    f"Length: {len(self.sim.snake)}",
+                    f"Score: {self.sim.total_eggs_collected}",
+                    f"Eggs Collected: {self.sim.total_eggs_collected}"
+                ]
+
+                for i, stat in enumerate(stats):
+                    stat_text = render_text(stat, stats_size, (255, 255, 255))
+                    stat_rect = stat_text.get_rect(center=(summary_x + summary_width//2, summary_y + int(120 + i * 40) * self.scale_y))
+                    self.screen.blit(stat_text, stat_rect)
+
+                self.death_menu_button.draw(self.screen)
         
         elif self.game_state == GameState.PAUSE:
 
@@ -473,9 +702,9 @@ class SnakeGame:
             overlay.fill((0, 0, 0, 128))
             self.screen.blit(overlay, (0, 0))
             
-            title_font = pygame.font.Font(None, int(74 * min(self.scale_x, self.scale_y)))
-            title_shadow = title_font.render("Paused", True, (0, 0, 0))
-            title_text = title_font.render("Paused", True, (255, 255, 255))
+            title_size = int(74 * min(self.scale_x, self.scale_y))
+            title_shadow = render_text("Paused", title_size, (0, 0, 0))
+            title_text = render_text("Paused", title_size, (255, 255, 255))
             title_rect = title_text.get_rect(center=(self.display_width//2, int(200 * self.scale_y)))
             self.screen.blit(title_shadow, (title_rect.x + 2, title_rect.y + 2))
             self.screen.blit(title_text, title_rect)
@@ -484,138 +713,73 @@ class SnakeGame:
                 button.draw(self.screen)
         
         elif self.game_state == GameState.SETTINGS:
-            self.settings.draw(self.screen)
+            with self.profiler.section("settings.draw"):
+                self.settings.draw(self.screen)
         
         elif self.game_state == GameState.SHOP:
-            self.shop.draw(self.screen)
+            with self.profiler.section("shop.draw"):
+                self.shop.draw(self.screen)
         
         elif self.game_state == GameState.GAMBLING:
-            self.gambling.draw(self.screen)
+            with self.profiler.section("gambling.draw"):
+                self.gambling.draw(self.screen)
+        
+        if self.debug_mode:
+            self.draw_profiler_overlay()
         
         self.draw_transition()
         pygame.display.flip()
 
     def update(self):
-        current_time = pygame.time.get_ticks()
-        
-        self.update_transition()
+        # one fixed step of the game clock, timers due by the end of it run first
+        self.timers.advance(STEP_MS)
+        self.game_time = self.timers.now
+        current_time = self.game_time
         
         if self.game_state == GameState.PLAYING:
-            if current_time - self.last_moving_block_time >= self.moving_block_interval:
-                self.last_moving_block_time = current_time
-                self.moving_block_interval = random.randint(1500, 3000)
-                
-                side = random.choice(['top', 'right', 'bottom', 'left'])
-                if side == 'top':
-                    x = random.randrange(20, self.width - 40, 20)
-                    y = 20
-                    direction = (0, 20)
-                elif side == 'right':
-                    x = self.width - 40
-                    y = random.randrange(20, self.height - 40, 20)
-                    direction = (-20, 0)
-                elif side == 'bottom':
-                    x = random.randrange(20, self.width - 40, 20)
-                    y = self.height - 40
-                    direction = (0, -20)
-                else:  # left
-                    x = 20
-                    y = random.randrange(20, self.height - 40, 20)
-                    direction = (20, 0)
-                
-                pos = (x - (x % 20), y - (y % 20))
-                self.moving_blocks.append({
-                    'pos': pos,
-                    'direction': direction,
-                    'last_move': current_time,
-                    'move_interval': 1000
-                })
-            
-            for block in self.moving_blocks[:]:
-                if current_time - block['last_move'] >= block['move_interval']:
-                    block['last_move'] = current_time
-                    new_x = block['pos'][0] + block['direction'][0]
-                    new_y = block['pos'][1] + block['direction'][1]
-                    new_pos = (new_x - (new_x % 20), new_y - (new_y % 20))
-                    
-                    if (new_x < 20 or new_x >= self.width - 20 or 
-                        new_y < 20 or new_y >= self.height - 20):
-                        self.moving_blocks.remove(block)
-                        continue
-                    
-                    block['pos'] = new_pos
-            
-            if current_time - self.last_move_time >= self.move_interval:
-                self.last_move_time = current_time
-                
-                if self.direction_queue:
-                    self.direction = self.direction_queue.pop(0)
-
-                new_x = self.snake[0][0] + self.direction[0]
-                new_y = self.snake[0][1] + self.direction[1]
-                new_head = (new_x - (new_x % 20), new_y - (new_y % 20))
-                
-                for block in self.moving_blocks:
-                    if new_head == block['pos']:
-                        self.showing_death_summary = True
-                        self.death_summary_time = current_time
-                        return
-                
-                if (new_x < 20 or new_x >= self.width - 20 or
-                    new_y < 20 or new_y >= self.height - 20 or
-                    new_head in self.snake or new_head in self.obstacles):
+            if self.sim_paused:
+                self.sim.resume(current_time)
+                self.sim_paused = False
+            if not self.sim.dead:
+                gained = self.sim.update(current_time)
+                if self.replay is None and self.autopilot is None and gained:
+                    self.change_eggs(gained, "collect")
+                if self.sim.dead:
+                    self.save_replay()
                     self.showing_death_summary = True
-                    self.death_summary_time = current_time
-                    return
-
-                self.snake.insert(0, new_head)
-                
-                if self.upgrades["egg_magnet"] != 0:
-                    magnet_range = 20 * self.upgrades["egg_magnet"]
-                    for egg in self.egg_positions[:]:
-                        dx = egg[0] - new_head[0]
-                        dy = egg[1] - new_head[1]
-                        distance = (dx * dx + dy * dy) ** 0.5
-                        if distance <= magnet_range:
-                            egg_type = self.egg_types.pop(egg)
-                            self.egg_positions.remove(egg)
-                            if egg_type == "golden":
-                                self.eggs += 10 * self.upgrades["currency_multiplier"]
-                                self.eggs_collected += 10
-                                self.total_eggs_collected += 10 * self.upgrades["currency_multiplier"]
-                            else:
-                                self.eggs += self.upgrades["currency_multiplier"]
-                                self.eggs_collected += 1
-                                self.total_eggs_collected += self.upgrades["currency_multiplier"]
-                
-                if new_head in self.egg_positions:
-                    # Collect the egg at the head position
-                    egg_type = self.egg_types.pop(new_head)
-                    self.egg_positions.remove(new_head)
-                    if egg_type == "golden":
-                        self.eggs += 10 * self.upgrades["currency_multiplier"]
-                        self.eggs_collected += 10
-                        self.total_eggs_collected += 10 * self.upgrades["currency_multiplier"]
-                    else:
-                        self.eggs += self.upgrades["currency_multiplier"]
-                        self.eggs_collected += 1
-                        self.total_eggs_collected += self.upgrades["currency_multiplier"]
-                
-                if len(self.egg_positions) == 0:
-                    self.generate_eggs()
-                if self.eggs_collected >= self.upgrades["grow_rate"]:
-                    self.eggs_collected = 0
-                else:
-                    self.snake.pop()
-        elif self.game_state == GameState.GAMBLING:
-            self.gambling.update()
+                    self.death_timer = self.timers.after(4000, self.close_death_summary)
+        else:
+            self.sim_paused = True
+            if self.game_state == GameState.MENU:
+                self.asset_manager.poll()
+            elif self.game_state == GameState.GAMBLING:
+                with self.profiler.section("gambling.update"):
+                    self.gambling.update(STEP_MS / 1000)
 
     def run(self):
-        while True:
-            self.handle_input()
-            self.update()
-            self.draw()
-            self.clock.tick(60)
+        try:
+            last_frame = pygame.time.get_ticks()
+            while True:
+                self.profiler.begin_frame()
+                now = pygame.time.get_ticks()
+                self.accumulator += min(now - last_frame, MAX_FRAME_MS)
+                last_frame = now
+                with self.profiler.section("handle_input"):
+                    self.handle_input()
+                with self.profiler.section("update"):
+                    while self.accumulator >= STEP_MS:
+                        self.accumulator -= STEP_MS
+                        self.update()
+                with self.profiler.section("draw"):
+                    self.draw()
+                self.profiler.end_frame()
+                self.clock.tick(60)
+        except Exception:
+            # the input log of the round that crashed reproduces it
+            self.save_replay()
+            self.save_data(immediate=True)
+            self.journal.close()
+            raise
 
 if __name__ == "__main__":
     game = SnakeGame()
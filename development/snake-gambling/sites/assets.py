@@ -0,0 +1,170 @@
+import os
+import threading
+import time
+import pygame
+
+# every image the game uses, by the screen that needs it
+MANIFEST = {
+    "game": {
+        "wall": "wall_block.png",
+        "spikes": "spikes.png",
+        "egg": "egg.png",
+        "golden_egg": "golden_egg.png",
+        "snake_body": "snake_body.png",
+        "snake_head_up": "snake_head_up.png",
+        "snake_head_down": "snake_head_down.png",
+        "snake_head_left": "snake_head_left.png",
+        "snake_head_right": "snake_head_right.png"
+    },
+    "gambling": {
+        "slots_machine": "slots_machine.png",
+        "slots_lemon": "slots_lemon.png",
+        "slots_cherry": "slots_cherry.png",
+        "slots_orange": "slots_orange.png",
+        "slots_banana": "slots_banana.png",
+        "slots_grape": "slots_grape.png",
+        "slots_strawberry": "slots_strawberry.png",
+        "slots_melon": "slots_watermelon.png",
+        "wheel": "wheel.png"
+    },
+    "settings": {
+        "wasd": "WASD.png",
+        "arrow": "ARROW.png"
+    }
+}
+
+# sprites up to this size share one atlas surface
+ATLAS_MAX_SPRITE = 64
+ATLAS_WIDTH = 256
+
+
+class AssetManager:
+    # groups load on demand, or get decoded on a background thread ahead of time
+    def __init__(self, directory="assets", manifest=MANIFEST):
+        self.directory = directory
+        self.manifest = manifest
+        self.group_of = {name: group for group, files in manifest.items() for name in files}
+        self.images = {}
+        self.scaled_images = {}
+        self.atlases = {}
+        self.atlas_names = {}
+        self.load_times = {}
+        self.loaded = set()
+        self.decoded = {}
+        self.decode_times = {}
+        self.decoding = {}
+        self.lock = threading.Lock()
+
+    def load(self, groups=None):
+        for group in groups or self.manifest:
+            self.require(group)
+        return self
+
+    def decode(self, group):
+        # file reads and decoding only, convert_alpha needs the display and runs on the main thread
+        start = time.perf_counter()
+        images = {}
+        for name, filename in self.manifest[group].items():
+            try:
+                images[name] = pygame.image.load(os.path.join(self.directory, filename))
+            except Exception as e:
+                print(f"Error loading asset {filename}: {e}")
+        with self.lock:
+            self.decoded[group] = images
+            self.decode_times[group] = time.perf_counter() - start
+
+    def prefetch(self, groups):
+        for group in groups:
+            with self.lock:
+                if group in self.loaded or group in self.decoding:
+                    continue
+                thread = threading.Thread(target=self.decode, args=(group,), name=f"assets-{group}", daemon=True)
+                self.decoding[group] = thread
+            thread.start()
+
+    def ready(self, group):
+        with self.lock:
+            return group in self.loaded or group in self.decoded
+
+    def poll(self):
+        # finish groups the background threads are done with
+        with self.lock:
+            groups = [group for group in self.decoded if group not in self.loaded]
+        for group in groups:
+            self.require(group)
+
+    def require(self, group):
+        if group in self.loaded:
+            return
+        thread = self.decoding.get(group)
+        if thread is not None:
+            thread.join()
+        elif group not in self.decoded:
+            self.decode(group)
+        start = time.perf_counter()
+        with self.lock:
+            decoded = self.decoded.pop(group)
+            decode_time = self.decode_times.pop(group)
+            self.decoding.pop(group, None)
+        loaded = {name: image.convert_alpha() for name, image in decoded.items()}
+
+        small = {name: image for name, image in loaded.items()
+                 if image.get_width() <= ATLAS_MAX_SPRITE and image.get_height() <= ATLAS_MAX_SPRITE}
+        self.images.update({name: image for name, image in loaded.items() if name not in small})
+        self.images.update(self.pack_atlas(group, small))
+        self.load_times[group] = decode_time + time.perf_counter() - start
+        self.loaded.add(group)
+
+    def pack_atlas(self, group, images):
+        # shelf packing, tallest first so each row wastes little height
+        placements = {}
+        x = y = row_height = 0
+        for name in sorted(images, key=lambda n: -images[n].get_height()):
+            width, height = images[name].get_size()
+            if x + width > ATLAS_WIDTH:
+                x = 0
+                y += row_height
+                row_height = 0
+            placements[name] = pygame.Rect(x, y, width, height)
+            x += width
+            row_height = max(row_height, height)
+        if not placements:
+            return {}
+
+        atlas = pygame.Surface((ATLAS_WIDTH, y + row_height), pygame.SRCALPHA).convert_alpha()
+        atlas.fill((0, 0, 0, 0))
+        for name, rect in placements.items():
+            # additive blit onto a cleared atlas copies pixels and alpha unchanged
+            atlas.blit(images[name], rect, special_flags=pygame.BLEND_RGBA_ADD)
+        self.atlases[group] = atlas
+        self.atlas_names[group] = list(placements)
+        return {name: atlas.subsurface(rect) for name, rect in placements.items()}
+
+    def get(self, name):
+        if name not in self.images and name in self.group_of:
+            self.require(self.group_of[name])
+        return self.images.get(name)
+
+    def scaled(self, name, size):
+        # one scaled copy per size, sizes follow the display scale so this stays small
+        key = (name, size)
+        image = self.scaled_images.get(key)
+        if image is None:
+            source = self.get(name)
+            if source is None:
+                return None
+            image = source if source.get_size() == size else pygame.transform.scale(source, size)
+            self.scaled_images[key] = image
+        return image
+
+    def report(self):
+        parts = []
+        for group in self.manifest:
+            if group not in self.loaded:
+                continue
+            text = f"{group} {len(self.manifest[group])} files in {self.load_times[group] * 1000:.1f}ms"
+            if group in self.atlases:
+                atlas = self.atlases[group]
+                text += f" ({len(self.atlas_names[group])} in a {atlas.get_width()}x{atlas.get_height()} atlas)"
+            parts.append(text)
+        return "Loaded assets: " + ", ".join(parts)
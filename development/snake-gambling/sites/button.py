@@ -1,4 +1,5 @@
 import pygame
+from sites.text import render_text
 
 class Button:
     def __init__(self, x, y, width, height, text, game, color=(40, 40, 40), hover_color=(60, 60, 60)):
@@ -13,57 +14,71 @@ class Button:
         self.shadow_offset = 3
         self.shadow_color = (20, 20, 20)
         self.game = game
+        self.scaled_rect_key = None
+        self.scaled_rect = None
+        self.surfaces = {}
 
-    def draw(self, screen):
+    def get_scaled_rect(self):
+        key = (self.game.scale_x, self.game.scale_y, tuple(self.rect))
+        if key != self.scaled_rect_key:
+            scale_x, scale_y = self.game.scale_x, self.game.scale_y
+            self.scaled_rect = pygame.Rect(
+                int(self.rect.x * scale_x),
+                int(self.rect.y * scale_y),
+                int(self.rect.width * scale_x),
+                int(self.rect.height * scale_y)
+            )
+            self.scaled_rect_key = key
+            self.surfaces = {}
+        return self.scaled_rect
+
+    def render(self, scaled_rect, hovered):
         scale_x = self.game.scale_x
         scale_y = self.game.scale_y
-        
-
-        scaled_rect = pygame.Rect(
-            int(self.rect.x * scale_x),
-            int(self.rect.y * scale_y),
-            int(self.rect.width * scale_x),
-            int(self.rect.height * scale_y)
-        )
-        
+        radius = int(self.corner_radius * min(scale_x, scale_y))
 
         shadow_rect = scaled_rect.copy()
         shadow_rect.x += int(self.shadow_offset * scale_x)
         shadow_rect.y += int(self.shadow_offset * scale_y)
-        pygame.draw.rect(screen, self.shadow_color, shadow_rect, border_radius=int(self.corner_radius * min(scale_x, scale_y)))
-        
 
-        pygame.draw.rect(screen, self.current_color, scaled_rect, border_radius=int(self.corner_radius * min(scale_x, scale_y)))
+        font_size = int(36 * min(scale_x, scale_y))
+        text_surface = render_text(self.text, font_size, (255, 255, 255))
+        text_rect = text_surface.get_rect(center=scaled_rect.center)
+        text_shadow_surface = render_text(self.text, font_size, (0, 0, 0))
+        text_shadow_rect = text_rect.copy()
+        text_shadow_rect.x += int(1 * scale_x)
+        text_shadow_rect.y += int(1 * scale_y)
 
-        border_color = (100, 100, 100) if self.is_hovered else (80, 80, 80)
-        pygame.draw.rect(screen, border_color, scaled_rect, int(2 * min(scale_x, scale_y)), border_radius=int(self.corner_radius * min(scale_x, scale_y)))
+        # everything is drawn relative to the bounding box so the whole button is one blit
+        bounds = scaled_rect.unionall([shadow_rect, text_rect, text_shadow_rect])
+        surface = pygame.Surface(bounds.size, pygame.SRCALPHA)
+        offset = (-bounds.x, -bounds.y)
 
-        font = pygame.font.Font(None, int(36 * min(scale_x, scale_y)))
-        text_surface = font.render(self.text, True, (255, 255, 255))
-        text_rect = text_surface.get_rect(center=scaled_rect.center)
+        pygame.draw.rect(surface, self.shadow_color, shadow_rect.move(offset), border_radius=radius)
+        pygame.draw.rect(surface, self.current_color, scaled_rect.move(offset), border_radius=radius)
+        border_color = (100, 100, 100) if hovered else (80, 80, 80)
+        pygame.draw.rect(surface, border_color, scaled_rect.move(offset), int(2 * min(scale_x, scale_y)), border_radius=radius)
 
-        shadow_surface = font.render(self.text, True, (0, 0, 0))
-        shadow_rect = text_rect.copy()
-        shadow_rect.x += int(1 * scale_x)
-        shadow_rect.y += int(1 * scale_y)
-        screen.blit(shadow_surface, shadow_rect)
+        surface.blit(text_shadow_surface, text_shadow_rect.move(offset))
+        surface.blit(text_surface, text_rect.move(offset))
+        return surface, bounds.topleft
 
-        screen.blit(text_surface, text_rect)
+    def draw(self, screen):
+        scaled_rect = self.get_scaled_rect()
+        key = (self.text, self.current_color, self.is_hovered)
+        cached = self.surfaces.get(key)
+        if cached is None:
+            cached = self.render(scaled_rect, self.is_hovered)
+            self.surfaces[key] = cached
+        surface, pos = cached
+        screen.blit(surface, pos)
 
     def handle_event(self, event):
-        scale_x = self.game.scale_x
-        scale_y = self.game.scale_y
+        scaled_rect = self.get_scaled_rect()
 
-        scaled_rect = pygame.Rect(
-            int(self.rect.x * scale_x),
-            int(self.rect.y * scale_y),
-            int(self.rect.width * scale_x),
-            int(self.rect.height * scale_y)
-        )
-        
         if event.type == pygame.MOUSEMOTION:
             self.is_hovered = scaled_rect.collidepoint(event.pos)
         elif event.type == pygame.MOUSEBUTTONDOWN:
             if self.is_hovered:
                 return True
-        return False 
\ No newline at end of file
+        return False
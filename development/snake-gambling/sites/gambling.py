@@ -1,44 +1,55 @@
 import pygame
-import random
 import math
 from sites.button import Button
+from sites.text import render_text
+from core.casino import default_config, slot_multiplier, roll_slots, reel_strip, WheelTable
+from core.odds import SlotOdds
 
 class Gambling:
     def __init__(self, game):
         self.game = game
         self.current_game = None
         self.bet_amount = 10
-        self.slots = ["lemon", "cherry", "orange", "banana", "grape", "strawberry", "melon"]
-        self.slot_multipliers = {
-            "lemon": 1.25,
-            "cherry": 1.5,
-            "orange": 2.0,
-            "banana": 2.5,
-            "grape": 3.0,
-            "strawberry": 5.0,
-            "melon": 7.5
-        }
+        config = default_config()
+        self.slots = config.slots
+        self.slot_multipliers = config.slot_multipliers
         self.slot_results = ["lemon", "lemon", "lemon"]
         self.spinning = False
         self.spin_time = 0
         self.slot_spin_times = [0, 0, 0]
         self.slot_spin_delays = [0, 500, 1000]
         self.slot_spin_speeds = [0, 0, 0]
+        self.slot_spin_duration = 2000
+        self.slot_outcome = list(self.slot_results)
+        self.slot_strips = [[fruit] for fruit in self.slot_results]
         self.max_spin_speed = 100
         self.acceleration = 200
         self.deceleration = 150
         self.wheel_angle = 0
         self.wheel_spinning = False
-        self.last_frame_time = pygame.time.get_ticks()
         self.rotation_count = 0
         self.start_angle = 0
         self.total_rotation = 0
         self.initial_phase = True
         self.last_win = None
         self.last_multiplier = None
-        self.win_display_time = 0
-        self.non_matching_spins = 0
-        self.max_non_matching_spins = 5
+        # the slots "Win:" line and the "Won:" banner start together but stay up for different times
+        self.showing_win_text = False
+        self.showing_win = False
+        self.win_text_timer = None
+        self.win_timer = None
+        
+        # rotated wheel sprites in 2 degree steps over one quarter turn, the other quarters are
+        # exact 90 degree turns of those: 45 sprites at most, about 115MB for the 800px wheel at 1440p
+        self.wheel_cache_size = None
+        self.wheel_scaled = None
+        self.wheel_step = 2
+        self.wheel_rotations = {}
+        # below this many degrees per drawn frame the wheel is rotated to the exact angle
+        self.wheel_exact_speed = 1
+        self.wheel_small = None
+        self.wheel_exact = None
+        self.last_drawn_angle = None
         
         self.slot_positions = [
             (34, 142), 
@@ -47,51 +58,74 @@ class Gambling:
         ]
         self.slot_size = (50, 50)
         
-        self.load_slot_assets()
+        # filled in by load_assets the first time the screen is drawn
+        self.assets_loaded = False
+        self.slot_machine = None
+        self.fruit_images = {}
+        self.wheel_image = None
         
         # wheel angles
-        self.wheel_sections = [
-            {"name": "1 POINT", "multiplier": 0.5, "odds": 0.48, "ranges": [
-                (350, 3), (18, 31), (46, 59), (74, 88), (103, 117), (147, 160),
-                (175, 189), (204, 219), (234, 248), (264, 278), (293, 308), (322, 336)
-            ]},
-            {"name": "3 POINT", "multiplier": 1.25, "odds": 0.24, "ranges": [
-                (4, 17), (60, 73), (132, 146), (190, 203), (249, 263), (309, 321)
-            ]},
-            {"name": "5 POINT", "multiplier": 2.0, "odds": 0.16, "ranges": [
-                (89, 102), (118, 131), (220, 233), (337, 349)
-            ]},
-            {"name": "10 POINT", "multiplier": 5.0, "odds": 0.08, "ranges": [
-                (32, 45), (161, 174)
-            ]},
-            {"name": "20 POINT", "multiplier": 10.0, "odds": 0.04, "ranges": [
-                (279, 292)
-            ]}
-        ]
+        self.wheel_sections = config.wheel_sections
+        self.wheel_table = WheelTable(self.wheel_sections)
+        self.slot_odds = SlotOdds(self)
         
         self.setup_buttons()
-        self.load_wheel_image()
 
     def get_current_section(self):
-        angle = self.wheel_angle % 360
-        for section in self.wheel_sections:
-            for start, end in section["ranges"]:
-                if start <= end:
-                    if start <= angle <= end:
-                        return section
-                else:  
-                    if angle >= start or angle <= end:
-                        return section
-        return None
+        return self.wheel_table.section_at(self.wheel_angle)
+
+    def load_assets(self):
+        self.load_slot_assets()
+        self.load_wheel_image()
+        self.assets_loaded = True
 
     def load_wheel_image(self):
-        try:
-            self.wheel_image = pygame.image.load("assets/wheel.png")
-            self.wheel_image = pygame.transform.scale(self.wheel_image, (400, 400))
-            self.wheel_rect = self.wheel_image.get_rect()
-        except:
+        self.wheel_image = self.game.asset_manager.get("wheel")
+        if self.wheel_image is None:
             print("Warning: wheel.png not found. Using default wheel.")
-            self.wheel_image = None
+
+    def rotate_wheel(self, angle, image=None):
+        image = image or self.wheel_scaled
+        size = image.get_width()
+        rotated = pygame.transform.rotate(image, angle)
+        # the wheel is round, so the grown corners of the rotated image are empty
+        crop = pygame.Rect(0, 0, size, size)
+        crop.center = rotated.get_rect().center
+        if size != self.wheel_cache_size:
+            return pygame.transform.scale(rotated.subsurface(crop), (self.wheel_cache_size, self.wheel_cache_size))
+        return rotated.subsurface(crop).copy()
+
+    def get_wheel_sprite(self, wheel_size, angle):
+        if wheel_size != self.wheel_cache_size:
+            self.wheel_cache_size = wheel_size
+            self.wheel_scaled = self.game.asset_manager.scaled("wheel", (wheel_size, wheel_size))
+            # slow frames rotate the wheel at its own resolution and scale that up, much cheaper on big screens
+            side = max(self.wheel_image.get_size())
+            self.wheel_small = self.game.asset_manager.scaled("wheel", (side, side)) if side < wheel_size else None
+            self.wheel_rotations = {}
+            self.wheel_exact = None
+            self.last_drawn_angle = None
+
+        angle = angle % 360
+        moved = abs(angle - self.last_drawn_angle) if self.last_drawn_angle is not None else 360
+        moved = min(moved, 360 - moved)
+        self.last_drawn_angle = angle
+
+        # stopped: rotate exactly and keep it, slow: rotate every frame, fast: quantized lookup
+        if moved == 0 or moved < self.wheel_exact_speed and self.wheel_small is None:
+            if self.wheel_exact is None or self.wheel_exact[0] != angle:
+                self.wheel_exact = (angle, self.rotate_wheel(angle))
+            return self.wheel_exact[1]
+        if moved < self.wheel_exact_speed:
+            return self.rotate_wheel(angle, self.wheel_small)
+
+        step = int(round(angle / self.wheel_step)) % (360 // self.wheel_step)
+        quarter, offset = divmod(step * self.wheel_step, 90)
+        sprite = self.wheel_rotations.get(offset)
+        if sprite is None:
+            sprite = self.rotate_wheel(offset)
+            self.wheel_rotations[offset] = sprite
+        return pygame.transform.rotate(sprite, quarter * 90) if quarter else sprite
 
     def setup_buttons(self):
         button_width = 200
@@ -124,7 +158,7 @@ class Gambling:
 
     def get_random_section(self):
         
-        rand = random.random()
+        rand = self.game.rng.wheel.random()
         cumulative_prob = 0
         
        
@@ -137,49 +171,38 @@ class Gambling:
         return self.wheel_sections[0]
 
     def get_random_angle_for_section(self, section):
-        
-        start, end = random.choice(section["ranges"])
-        
-       
-        if start > end:
-            
-            if random.random() < 0.5:
-                return random.uniform(start, 360)
-            else:
-                return random.uniform(0, end)
-        else:
-            
-            return random.uniform(start, end)
+        return self.wheel_table.random_angle(self.game.rng.wheel, self.wheel_sections.index(section))
 
     def draw(self, screen):
+        if not self.assets_loaded:
+            self.load_assets()
         screen.fill((20, 20, 20))
         
-        font = pygame.font.Font(None, int(74 * min(self.game.scale_x, self.game.scale_y)))
-        title_shadow = font.render("Gambling", True, (0, 0, 0))
-        title_text = font.render("Gambling", True, (255, 255, 255))
+        font_size = int(74 * min(self.game.scale_x, self.game.scale_y))
+        title_shadow = render_text("Gambling", font_size, (0, 0, 0))
+        title_text = render_text("Gambling", font_size, (255, 255, 255))
         title_rect = title_text.get_rect(center=(self.game.display_width//2, int(50 * self.game.scale_y)))
         screen.blit(title_shadow, (title_rect.x + 2, title_rect.y + 2))
         screen.blit(title_text, title_rect)
         
-        font = pygame.font.Font(None, int(36 * min(self.game.scale_x, self.game.scale_y)))
-        eggs_text = font.render(f"{self.game.eggs}", True, (255, 255, 255))
-        eggs_shadow = font.render(f"{self.game.eggs}", True, (0, 0, 0))
-        egg_img = pygame.image.load("assets/egg.png").convert_alpha()
-        egg_img = pygame.transform.scale(egg_img, (int(30 * self.game.scale_x), int(30 * self.game.scale_y)))
+        font_size = int(36 * min(self.game.scale_x, self.game.scale_y))
+        eggs_text = render_text(f"{self.game.eggs}", font_size, (255, 255, 255))
+        eggs_shadow = render_text(f"{self.game.eggs}", font_size, (0, 0, 0))
+        egg_img = self.game.asset_manager.scaled("egg", (int(30 * self.game.scale_x), int(30 * self.game.scale_y)))
         screen.blit(egg_img, (int(10 * self.game.scale_x), int(10 * self.game.scale_y)))
         screen.blit(eggs_shadow, (int(45 * self.game.scale_x), int(12 * self.game.scale_y)))
         screen.blit(eggs_text, (int(43 * self.game.scale_x), int(10 * self.game.scale_y)))
         
         if self.current_game is None:
-            subtitle = font.render("Select Game Mode", True, (255, 255, 255))
+            subtitle = render_text("Select Game Mode", font_size, (255, 255, 255))
             screen.blit(subtitle, (self.game.display_width//2 - subtitle.get_width()//2, int(200 * self.game.scale_y)))
             
             for button in self.mode_buttons.values():
                 button.draw(screen)
         else:
             
-            bet_shadow = font.render(f"Bet: {self.bet_amount}", True, (0, 0, 0))
-            bet_text = font.render(f"Bet: {self.bet_amount}", True, (255, 255, 255))
+            bet_shadow = render_text(f"Bet: {self.bet_amount}", font_size, (0, 0, 0))
+            bet_text = render_text(f"Bet: {self.bet_amount}", font_size, (255, 255, 255))
             bet_rect = bet_text.get_rect(center=(self.game.display_width//2, int(350 * self.game.scale_y)))
             screen.blit(bet_shadow, (bet_rect.x + 2, bet_rect.y + 2))
             screen.blit(bet_text, bet_rect)
@@ -196,6 +219,13 @@ class Gambling:
                     button.draw(screen)
                 if not self.spinning and self.bet_amount > 0:
                     self.spin_button.draw(screen)
+                
+                if self.game.debug_mode and self.bet_amount > 0:
+                    odds = self.slot_odds.solve(self.bet_amount)
+                    rtp_text = render_text(f"Exact RTP: {odds['rtp']:.2%}", font_size, (255, 255, 255))
+                    screen.blit(rtp_text, (int(10 * self.game.scale_x), int(80 * self.game.scale_y)))
+                    hit_text = render_text(f"Hit chance: {odds['hit_frequency']:.2%}", font_size, (255, 255, 255))
+                    screen.blit(hit_text, (int(10 * self.game.scale_x), int(120 * self.game.scale_y)))
             else:
                 self.draw_wheel(screen)
                 
@@ -206,29 +236,29 @@ class Gambling:
                 
                 
                 if self.game.debug_mode:
-                    debug_text = font.render(f"Wheel Angle: {self.wheel_angle:.1f}°", True, (255, 255, 255))
+                    debug_text = render_text(f"Wheel Angle: {self.wheel_angle:.1f}°", font_size, (255, 255, 255))
                     screen.blit(debug_text, (int(10 * self.game.scale_x), int(80 * self.game.scale_y)))
                     
                     current_section = self.get_current_section()
                     if current_section:
-                        section_text = font.render(
+                        section_text = render_text(
                             f"Current Section: {current_section['name']} ({current_section['multiplier']}x)", 
-                            True, (255, 255, 255)
+                            font_size, (255, 255, 255)
                         )
                         screen.blit(section_text, (int(10 * self.game.scale_x), int(120 * self.game.scale_y)))
                     
                     
                     if self.wheel_spinning:
-                        rotation_text = font.render(f"Rotations: {self.rotation_count}", True, (255, 255, 255))
+                        rotation_text = render_text(f"Rotations: {self.rotation_count}", font_size, (255, 255, 255))
                         screen.blit(rotation_text, (int(10 * self.game.scale_x), int(160 * self.game.scale_y)))
                     
                     
                     for button in self.debug_buttons.values():
                         button.draw(screen)
 
-        back_text = font.render("Press ESC to return", True, (255, 255, 255))
+        back_text = render_text("Press ESC to return", font_size, (255, 255, 255))
         back_rect = back_text.get_rect(center=(self.game.display_width//2, self.game.display_height - int(50 * self.game.scale_y)))
-        back_shadow = font.render("Press ESC to return", True, (0, 0, 0))
+        back_shadow = render_text("Press ESC to return", font_size, (0, 0, 0))
         screen.blit(back_shadow, (back_rect.x + 2, back_rect.y + 2))
         screen.blit(back_text, back_rect)
 
@@ -236,9 +266,9 @@ class Gambling:
         if not self.slot_machine:
             return
 
-        if self.last_win is not None and pygame.time.get_ticks() - self.win_display_time < 2000:
-            font = pygame.font.Font(None, int(36 * min(self.game.scale_x, self.game.scale_y)))
-            win_text = font.render(f"Win: {self.last_win} eggs!", True, (255, 215, 0))
+        if self.last_win is not None and self.showing_win_text:
+            font_size = int(36 * min(self.game.scale_x, self.game.scale_y))
+            win_text = render_text(f"Win: {self.last_win} eggs!", font_size, (255, 215, 0))
             screen.blit(win_text, (self.game.display_width//2 - win_text.get_width()//2, int(200 * self.game.scale_y)))
 
         slot_machine_rect = self.slot_machine.get_rect(center=(self.game.display_width//2, self.game.display_height//2))
@@ -251,9 +281,9 @@ class Gambling:
                 slot_y = slot_machine_rect.y + self.slot_positions[i][1]
                 screen.blit(fruit_img, (slot_x, slot_y))
 
-        font = pygame.font.Font(None, int(36 * min(self.game.scale_x, self.game.scale_y)))
-        bet_shadow = font.render(f"Bet: {self.bet_amount}", True, (0, 0, 0))
-        bet_text = font.render(f"Bet: {self.bet_amount}", True, (255, 255, 255))
+        font_size = int(36 * min(self.game.scale_x, self.game.scale_y))
+        bet_shadow = render_text(f"Bet: {self.bet_amount}", font_size, (0, 0, 0))
+        bet_text = render_text(f"Bet: {self.bet_amount}", font_size, (255, 255, 255))
         bottom_y = self.game.height - 150
         bet_rect = bet_text.get_rect(center=(self.game.display_width//2, bottom_y + 230))
         screen.blit(bet_shadow, (bet_rect.x + 2, bet_rect.y + 2))
@@ -265,8 +295,7 @@ class Gambling:
 
         if self.wheel_image:
             wheel_size = int(400 * min(self.game.scale_x, self.game.scale_y))
-            scaled_wheel = pygame.transform.scale(self.wheel_image, (wheel_size, wheel_size))
-            rotated_wheel = pygame.transform.rotate(scaled_wheel, self.wheel_angle)
+            rotated_wheel = self.get_wheel_sprite(wheel_size, self.wheel_angle)
             wheel_rect = rotated_wheel.get_rect(center=(center_x, center_y))
             screen.blit(rotated_wheel, wheel_rect)
         else:
@@ -280,53 +309,37 @@ class Gambling:
         ]
         pygame.draw.polygon(screen, (255, 255, 255), pointer_points)
 
-        bet_font = pygame.font.Font(None, int(36 * min(self.game.scale_x, self.game.scale_y)))
-        bet_shadow = bet_font.render(f"Bet: {self.bet_amount}", True, (0, 0, 0))
-        bet_text = bet_font.render(f"Bet: {self.bet_amount}", True, (255, 255, 255))
+        bet_size = int(36 * min(self.game.scale_x, self.game.scale_y))
+        bet_shadow = render_text(f"Bet: {self.bet_amount}", bet_size, (0, 0, 0))
+        bet_text = render_text(f"Bet: {self.bet_amount}", bet_size, (255, 255, 255))
         bottom_y = self.game.height - 150
         bet_rect = bet_text.get_rect(center=(center_x, bottom_y + 230))
         screen.blit(bet_shadow, (bet_rect.x + 2, bet_rect.y + 2))
         screen.blit(bet_text, bet_rect)
 
-        current_time = pygame.time.get_ticks()
-        if self.last_win and current_time - self.win_display_time < 3000:
-            win_font = pygame.font.Font(None, int(48 * min(self.game.scale_x, self.game.scale_y)))
+        if self.last_win and self.showing_win:
+            win_size = int(48 * min(self.game.scale_x, self.game.scale_y))
             win_text = f"Won: {self.last_win} eggs! (x{self.last_multiplier})"
-            win_shadow = win_font.render(win_text, True, (0, 0, 0))
-            win_text = win_font.render(win_text, True, (255, 215, 0))
+            win_shadow = render_text(win_text, win_size, (0, 0, 0))
+            win_text = render_text(win_text, win_size, (255, 215, 0))
             win_rect = win_text.get_rect(center=(self.game.display_width//2, self.game.display_height//2))
             screen.blit(win_shadow, (win_rect.x + 2, win_rect.y + 2))
             screen.blit(win_text, win_rect)
 
-    def update(self):
-        current_time = pygame.time.get_ticks()
-        delta_time = (current_time - self.last_frame_time) / 1000.0  
-        self.last_frame_time = current_time
+    def update(self, delta_time):
+        # called every fixed step of the game clock, delta_time is that step in seconds
+        current_time = self.game.game_time
 
         if self.spinning:
-            all_slots_stopped = True
             for i in range(3):
-                if current_time - self.spin_time >= self.slot_spin_delays[i]:
-                    slot_spin_time = current_time - (self.spin_time + self.slot_spin_delays[i])
-                    
-                    if slot_spin_time < 2000:
-                        all_slots_stopped = False
-                        
-                        if slot_spin_time < 500:
-                            self.slot_spin_speeds[i] = min(self.slot_spin_speeds[i] + self.acceleration * delta_time, self.max_spin_speed)
-                        elif slot_spin_time > 1500:
-                            self.slot_spin_speeds[i] = max(self.slot_spin_speeds[i] - self.deceleration * delta_time, 0)
-                        
-                        if self.slot_spin_speeds[i] > 0 and current_time % int(1000 / self.slot_spin_speeds[i]) < int(500 / self.slot_spin_speeds[i]):
-                            self.slot_results[i] = self.get_weighted_random_fruit(i)
-                    else:
-                        self.slot_spin_speeds[i] = 0
-                        if self.slot_results[i] == self.slot_results[0] and i > 0:
-                            self.slot_results[i] = random.choice([f for f in self.slots if f != self.slot_results[0]])
-
-            if all_slots_stopped:
-                self.spinning = False
-                self.check_slots_win()
+                slot_spin_time = current_time - (self.spin_time + self.slot_spin_delays[i])
+                if 0 <= slot_spin_time < self.slot_spin_duration:
+                    position, self.slot_spin_speeds[i] = self.reel_position(slot_spin_time)
+                    strip = self.slot_strips[i]
+                    self.slot_results[i] = strip[min(int(position), len(strip) - 1)]
+                elif slot_spin_time >= self.slot_spin_duration:
+                    self.slot_spin_speeds[i] = 0
+                    self.slot_results[i] = self.slot_outcome[i]
 
         if self.wheel_spinning:
             
@@ -398,52 +411,64 @@ class Gambling:
             else:
                 self.wheel_angle = (self.wheel_angle + rotation_this_frame) % 360
 
-    def get_weighted_random_fruit(self, index):
-        if self.spinning:
-            available_fruits = [f for f in self.slots if f != self.slot_results[index]]
-            if self.non_matching_spins > 0:
-                if index == 0:
-                    return random.choice(available_fruits)
-                elif index == 1:
-                    if random.random() < min(0.2 * self.non_matching_spins, 0.8):
-                        return self.slot_results[0]
-                    return random.choice(available_fruits)
-                else:
-                    if random.random() < min(0.15 * self.non_matching_spins, 0.6):
-                        return self.slot_results[0]
-                    return random.choice(available_fruits)
-            return random.choice(available_fruits)
-        return random.choice(self.slots)
+    def reel_position(self, slot_spin_time):
+        # symbols scrolled after slot_spin_time ms: speed up, hold max speed, slow down
+        t = slot_spin_time / 1000.0
+        ramp = min(0.5, self.max_spin_speed / self.acceleration)
+        if t < ramp:
+            return self.acceleration * t * t / 2, self.acceleration * t
+        position = self.acceleration * ramp * ramp / 2
+        speed = self.acceleration * ramp
+        if t < 1.5:
+            return position + speed * (t - ramp), speed
+        position += speed * (1.5 - ramp)
+        slow = min(t - 1.5, speed / self.deceleration)
+        return position + speed * slow - self.deceleration * slow * slow / 2, speed - self.deceleration * slow
 
-    def check_slots_win(self):
-        if len(set(self.slot_results)) == 1:
-            fruit = self.slot_results[0]
-            multiplier = self.slot_multipliers[fruit] * 3
-            self.non_matching_spins = 0
-        elif len(set(self.slot_results)) == 2:
-            for fruit in set(self.slot_results):
-                if self.slot_results.count(fruit) == 2:
-                    multiplier = self.slot_multipliers[fruit] * 1
-                    self.non_matching_spins = 0
-                    break
-        else:
-            multiplier = 0.5
-            self.non_matching_spins = min(self.non_matching_spins + 1, self.max_non_matching_spins)
+    def start_slot_spin(self):
+        self.slot_outcome = roll_slots(self.game.rng.slots, self.slots)
+        length = int(self.reel_position(self.slot_spin_duration)[0]) + 1
+        self.slot_strips = [reel_strip(self.game.rng.cosmetic, self.slots, fruit, length) for fruit in self.slot_outcome]
+        self.spinning = True
+        self.spin_time = self.game.game_time
+        self.game.timers.after(max(self.slot_spin_delays) + self.slot_spin_duration, self.stop_slots)
+
+    def stop_slots(self):
+        self.spinning = False
+        self.slot_spin_speeds = [0, 0, 0]
+        self.slot_results = list(self.slot_outcome)
+        self.check_slots_win()
 
+    def show_win(self):
+        self.game.timers.cancel(self.win_text_timer)
+        self.game.timers.cancel(self.win_timer)
+        self.showing_win_text = True
+        self.showing_win = True
+        self.win_text_timer = self.game.timers.after(2000, self.hide_win_text)
+        self.win_timer = self.game.timers.after(3000, self.hide_win)
+
+    def hide_win_text(self):
+        self.showing_win_text = False
+
+    def hide_win(self):
+        self.showing_win = False
+
+    def check_slots_win(self):
+        multiplier, _ = slot_multiplier(self.slot_results, self.slot_multipliers)
         win_amount = int(self.bet_amount * multiplier)
-        self.game.eggs += win_amount
+        self.game.change_eggs(win_amount, "slots")
         self.last_win = win_amount
         self.last_multiplier = multiplier
-        self.win_display_time = pygame.time.get_ticks()
+        self.show_win()
 
     def check_wheel_win(self):
         current_section = self.get_current_section()
         if current_section:
             winnings = int(self.bet_amount * current_section["multiplier"]) 
-            self.game.eggs += winnings
+            self.game.change_eggs(winnings, "wheel")
             self.last_win = winnings
             self.last_multiplier = current_section["multiplier"]
-            self.win_display_time = pygame.time.get_ticks()
+            self.show_win()
             print(f"Won {winnings} eggs! ({current_section['name']} - {current_section['multiplier']}x)")
 
     def handle_input(self, event):
@@ -474,10 +499,9 @@ class Gambling:
                 if not self.spinning and not self.wheel_spinning:
                     if self.spin_button.handle_event(event):
                         if self.game.eggs >= self.bet_amount:
-                            self.game.eggs -= self.bet_amount
+                            self.game.change_eggs(-self.bet_amount, "bet")
                             if self.current_game == "slots":
-                                self.spinning = True
-                                self.spin_time = pygame.time.get_ticks()
+                                self.start_slot_spin()
                             else:
                                 self.wheel_spinning = True
                                 if hasattr(self, 'target_angle'):
@@ -494,18 +518,13 @@ class Gambling:
                 self.current_game = None 
 
     def load_slot_assets(self):
-        try:
-            self.slot_machine = pygame.image.load("assets/slots_machine.png").convert_alpha()
-            self.fruit_images = {
-                "lemon": pygame.image.load("assets/slots_lemon.png").convert_alpha(),
-                "cherry": pygame.image.load("assets/slots_cherry.png").convert_alpha(),
-                "orange": pygame.image.load("assets/slots_orange.png").convert_alpha(),
-                "banana": pygame.image.load("assets/slots_banana.png").convert_alpha(),
-                "grape": pygame.image.load("assets/slots_grape.png").convert_alpha(),
-                "strawberry": pygame.image.load("assets/slots_strawberry.png").convert_alpha(),
-                "melon": pygame.image.load("assets/slots_watermelon.png").convert_alpha()
-            }
-        except Exception as e:
-            print(f"Error loading slot assets: {e}")
-            self.slot_machine = None
-            self.fruit_images = {}
+        assets = self.game.asset_manager
+        self.slot_machine = assets.get("slots_machine")
+        self.fruit_images = {}
+        for fruit in ("lemon", "cherry", "orange", "banana", "grape", "strawberry", "melon"):
+            image = assets.get(f"slots_{fruit}")
+            if image is None:
+                self.slot_machine = None
+                self.fruit_images = {}
+                break
+            self.fruit_images[fruit] = image
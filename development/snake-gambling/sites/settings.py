@@ -1,5 +1,6 @@
 import pygame
 import math
+from sites.text import render_text
 
 class Button:
     def __init__(self, x, y, width, height, text, game, color=(100, 100, 100), hover_color=(150, 150, 150)):
@@ -15,8 +16,7 @@ class Button:
         pygame.draw.rect(screen, color, self.rect)
         pygame.draw.rect(screen, (255, 255, 255), self.rect, 2)
         
-        font = pygame.font.Font(None, 36)
-        text_surface = font.render(self.text, True, (255, 255, 255))
+        text_surface = render_text(self.text, 36, (255, 255, 255))
         text_rect = text_surface.get_rect(center=self.rect.center)
         screen.blit(text_surface, text_rect)
 
@@ -32,31 +32,25 @@ class Settings:
     def __init__(self, game):
         self.game = game
         self.setup_buttons()
-        self.load_images()
         self.selection_x = 0
         self.target_x = 0
         self.animation_speed = 0.2
 
-    def load_images(self):
-        self.wasd_image = pygame.image.load("assets/WASD.png")
-        self.arrow_image = pygame.image.load("assets/ARROW.png")
-        self.wasd_image = pygame.transform.scale(self.wasd_image, (100, 100))
-        self.arrow_image = pygame.transform.scale(self.arrow_image, (100, 100))
-
     def setup_buttons(self):
         button_width = 200
         button_height = 50
         center_x = self.game.display_width // 2 - button_width // 2
         
         self.buttons = {
+            "render_mode": Button(center_x, self.game.height - 170, button_width, button_height, "Render: Dirty", self.game),
             "back": Button(center_x, self.game.height - 100, button_width, button_height, "Back", self.game)
         }
 
     def draw(self, screen):
         screen.fill((20, 20, 20))
         
-        title_font = pygame.font.Font(None, int(74 * min(self.game.scale_x, self.game.scale_y)))
-        title_text = title_font.render("Settings", True, (255, 255, 255))
+        title_size = int(74 * min(self.game.scale_x, self.game.scale_y))
+        title_text = render_text("Settings", title_size, (255, 255, 255))
         title_rect = title_text.get_rect(center=(self.game.display_width//2, int(200 * self.game.scale_y)))
         screen.blit(title_text, title_rect)
         
@@ -70,8 +64,8 @@ class Settings:
         
         wasd_size = int(100 * min(self.game.scale_x, self.game.scale_y))
         arrow_size = int(100 * min(self.game.scale_x, self.game.scale_y))
-        scaled_wasd = pygame.transform.scale(self.wasd_image, (wasd_size, wasd_size))
-        scaled_arrow = pygame.transform.scale(self.arrow_image, (arrow_size, arrow_size))
+        scaled_wasd = self.game.asset_manager.scaled("wasd", (wasd_size, wasd_size))
+        scaled_arrow = self.game.asset_manager.scaled("arrow", (arrow_size, arrow_size))
         
         wasd_rect = scaled_wasd.get_rect(topleft=(input_x + int(10 * self.game.scale_x), input_y + int(10 * self.game.scale_y)))
         screen.blit(scaled_wasd, wasd_rect)
@@ -87,12 +81,14 @@ class Settings:
         indicator_rect = pygame.Rect(self.selection_x, input_y + int(10 * self.game.scale_y), indicator_width, indicator_height)
         pygame.draw.rect(screen, (0, 255, 0, 128), indicator_rect, 2, border_radius=int(10 * min(self.game.scale_x, self.game.scale_y)))
         
-        self.buttons["back"].draw(screen)
+        self.buttons["render_mode"].text = "Render: Dirty" if self.game.dirty_rendering else "Render: Full"
+        for button in self.buttons.values():
+            button.draw(screen)
         
-        font = pygame.font.Font(None, int(36 * min(self.game.scale_x, self.game.scale_y)))
-        back_text = font.render("Press ESC to return", True, (255, 255, 255))
+        font_size = int(36 * min(self.game.scale_x, self.game.scale_y))
+        back_text = render_text("Press ESC to return", font_size, (255, 255, 255))
         back_rect = back_text.get_rect(center=(self.game.display_width//2, self.game.display_height - int(50 * self.game.scale_y)))
-        back_shadow = font.render("Press ESC to return", True, (0, 0, 0))
+        back_shadow = render_text("Press ESC to return", font_size, (0, 0, 0))
         screen.blit(back_shadow, (back_rect.x + 2, back_rect.y + 2))
         screen.blit(back_text, back_rect)
 
@@ -111,15 +107,21 @@ class Settings:
                                   int(100 * self.game.scale_x), int(100 * self.game.scale_y))
             if wasd_rect.collidepoint(mouse_pos):
                 self.game.use_arrow_keys = False
+                self.game.save_data()
                 return
                 
             arrow_rect = pygame.Rect(input_x + int(110 * self.game.scale_x), input_y + int(10 * self.game.scale_y), 
                                    int(100 * self.game.scale_x), int(100 * self.game.scale_y))
             if arrow_rect.collidepoint(mouse_pos):
                 self.game.use_arrow_keys = True
+                self.game.save_data()
                 return
             
             for button_name, button in self.buttons.items():
                 if button.handle_event(event):
-                    if button_name == "back":
+                    if button_name == "render_mode":
+                        self.game.dirty_rendering = not self.game.dirty_rendering
+                        self.game.sim.track_dirty = self.game.dirty_rendering
+                        self.game.save_data()
+                    elif button_name == "back":
                         self.game.game_state = self.game.previous_state 
\ No newline at end of file
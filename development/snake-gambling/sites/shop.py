@@ -1,5 +1,6 @@
 import pygame
 from sites.button import Button
+from sites.text import render_text
 
 class Shop:
     def __init__(self, game):
@@ -51,6 +52,23 @@ class Shop:
         }
         self.setup_buttons()
 
+    def set_level(self, item_id, level):
+        item = self.items["upgrades"][item_id]
+        item['level'] = min(level, item['max_level'])
+        if item_id == "grow_rate":
+            item['description'] = f"Grow every {item['level']} egg"
+        elif item_id == "currency_multiplier":
+            item['status'] = f"{item['level']}x eggs"
+            item['description'] = f"{item['level']}x eggs per collect"
+        elif item_id == "egg_magnet":
+            if item['level'] == 0:
+                item['description'] = "Collect eggs by touching"
+            else:
+                item['description'] = f"Pickup range: {item['level']} grid"
+        elif item_id == "golden_egg_chance":
+            item['description'] = f"Golden Egg chance: {5 * item['level']}%"
+        self.game.upgrades[item_id] = item['level']
+
     def setup_buttons(self):
         button_width = 200
         button_height = 50
@@ -63,18 +81,17 @@ class Shop:
     def draw(self, screen):
         screen.fill((20, 20, 20))
         
-        font = pygame.font.Font(None, int(74 * min(self.game.scale_x, self.game.scale_y)))
-        title_shadow = font.render("Shop", True, (0, 0, 0))
-        title_text = font.render("Shop", True, (255, 255, 255))
+        font_size = int(74 * min(self.game.scale_x, self.game.scale_y))
+        title_shadow = render_text("Shop", font_size, (0, 0, 0))
+        title_text = render_text("Shop", font_size, (255, 255, 255))
         title_rect = title_text.get_rect(center=(self.game.display_width//2, int(50 * self.game.scale_y)))
         screen.blit(title_shadow, (title_rect.x + 2, title_rect.y + 2))
         screen.blit(title_text, title_rect)
         
-        font = pygame.font.Font(None, int(36 * min(self.game.scale_x, self.game.scale_y)))
-        eggs_text = font.render(f"{self.game.eggs}", True, (255, 255, 255))
-        eggs_shadow = font.render(f"{self.game.eggs}", True, (0, 0, 0))
-        egg_img = pygame.image.load("assets/egg.png").convert_alpha()
-        egg_img = pygame.transform.scale(egg_img, (int(30 * self.game.scale_x), int(30 * self.game.scale_y)))
+        font_size = int(36 * min(self.game.scale_x, self.game.scale_y))
+        eggs_text = render_text(f"{self.game.eggs}", font_size, (255, 255, 255))
+        eggs_shadow = render_text(f"{self.game.eggs}", font_size, (0, 0, 0))
+        egg_img = self.game.asset_manager.scaled("egg", (int(30 * self.game.scale_x), int(30 * self.game.scale_y)))
         screen.blit(egg_img, (int(10 * self.game.scale_x), int(10 * self.game.scale_y)))
         screen.blit(eggs_shadow, (int(45 * self.game.scale_x), int(12 * self.game.scale_y)))
         screen.blit(eggs_text, (int(43 * self.game.scale_x), int(10 * self.game.scale_y)))
@@ -95,8 +112,8 @@ class Shop:
             pygame.draw.rect(screen, (60, 60, 60), (tab_x, tab_y, tab_width, tab_height), 2, border_radius=int(10 * min(self.game.scale_x, self.game.scale_y)))
             
             # tab text
-            tab_font = pygame.font.Font(None, int(36 * min(self.game.scale_x, self.game.scale_y)))
-            tab_text = tab_font.render(tab.capitalize(), True, (255, 255, 255))
+            tab_size = int(36 * min(self.game.scale_x, self.game.scale_y))
+            tab_text = render_text(tab.capitalize(), tab_size, (255, 255, 255))
             tab_text_rect = tab_text.get_rect(center=(tab_x + tab_width//2, tab_y + tab_height//2))
             screen.blit(tab_text, tab_text_rect)
         
@@ -116,23 +133,23 @@ class Shop:
             pygame.draw.rect(screen, (40, 40, 40), (item_x, item_y, item_width, item_height), border_radius=int(15 * min(self.game.scale_x, self.game.scale_y)))
             pygame.draw.rect(screen, (60, 60, 60), (item_x, item_y, item_width, item_height), 2, border_radius=int(15 * min(self.game.scale_x, self.game.scale_y)))
             
-            name_font = pygame.font.Font(None, int(36 * min(self.game.scale_x, self.game.scale_y)))
-            name_text = name_font.render(item['name'], True, (255, 255, 255))
+            name_size = int(36 * min(self.game.scale_x, self.game.scale_y))
+            name_text = render_text(item['name'], name_size, (255, 255, 255))
             name_rect = name_text.get_rect(center=(item_x + item_width//2, item_y + int(30 * self.game.scale_y)))
             screen.blit(name_text, name_rect)
             
-            cost_font = pygame.font.Font(None, int(24 * min(self.game.scale_x, self.game.scale_y)))
-            cost_text = cost_font.render(f"Cost: {item['cost']} eggs", True, (255, 255, 0))
+            cost_size = int(24 * min(self.game.scale_x, self.game.scale_y))
+            cost_text = render_text(f"Cost: {item['cost']} eggs", cost_size, (255, 255, 0))
             cost_rect = cost_text.get_rect(center=(item_x + item_width//2, item_y + int(60 * self.game.scale_y)))
             screen.blit(cost_text, cost_rect)
             
             if self.tabs[self.current_tab] == "upgrades":
-                level_text = cost_font.render(f"Level: {item['level']}/{item['max_level']}", True, (200, 200, 200))
+                level_text = render_text(f"Level: {item['level']}/{item['max_level']}", cost_size, (200, 200, 200))
                 level_rect = level_text.get_rect(center=(item_x + item_width//2, item_y + int(85 * self.game.scale_y)))
                 screen.blit(level_text, level_rect)
             
-            desc_font = pygame.font.Font(None, int(20 * min(self.game.scale_x, self.game.scale_y)))
-            desc_text = desc_font.render(item['description'], True, (200, 200, 200))
+            desc_size = int(20 * min(self.game.scale_x, self.game.scale_y))
+            desc_text = render_text(item['description'], desc_size, (200, 200, 200))
             desc_rect = desc_text.get_rect(center=(item_x + item_width//2, item_y + int(110 * self.game.scale_y)))
             screen.blit(desc_text, desc_rect)
             
@@ -149,16 +166,20 @@ class Shop:
             pygame.draw.rect(screen, (60, 60, 60), (button_x, button_y, button_width, button_height), border_radius=int(5 * min(self.game.scale_x, self.game.scale_y)))
             pygame.draw.rect(screen, (60, 60, 60), (button_x, button_y, button_width, button_height), 2, border_radius=int(5 * min(self.game.scale_x, self.game.scale_y)))
             
-            button_font = pygame.font.Font(None, int(24 * min(self.game.scale_x, self.game.scale_y)))
-            button_text = button_font.render(button_text, True, (255, 255, 255))
+            button_size = int(24 * min(self.game.scale_x, self.game.scale_y))
+            button_text = render_text(button_text, button_size, (255, 255, 255))
             button_rect = button_text.get_rect(center=(button_x + button_width//2, button_y + button_height//2))
             screen.blit(button_text, button_rect)
         
-        esc_font = pygame.font.Font(None, int(24 * min(self.game.scale_x, self.game.scale_y)))
-        esc_text = esc_font.render("Press ESC to go back", True, (200, 200, 200))
+        esc_size = int(24 * min(self.game.scale_x, self.game.scale_y))
+        esc_text = render_text("Press ESC to go back", esc_size, (200, 200, 200))
         esc_rect = esc_text.get_rect(center=(self.game.display_width//2, self.game.display_height - int(30 * self.game.scale_y)))
         screen.blit(esc_text, esc_rect)
 
+    def purchased(self):
+        # the journal already has the deduction, the item must not be lost to a crash
+        self.game.save_data(immediate=True)
+
     def handle_click(self, pos):
         tab_width = int(200 * self.game.scale_x)
         tab_height = int(50 * self.game.scale_y)
@@ -196,24 +217,14 @@ class Shop:
                 if self.game.eggs >= item['cost']:
                     if self.tabs[self.current_tab] == "upgrades":
                         if item['level'] < item['max_level']:
-                            self.game.eggs -= item['cost']
-                            item['level'] += 1
-                            if item_id == "grow_rate":
-                                item['description'] = f"Grow every {item['level']} egg"
-                            elif item_id == "currency_multiplier":
-                                item['status'] = f"{item['level']}x eggs"
-                                item['description'] = f"{item['level']}x eggs per collect"
-                            elif item_id == "egg_magnet":
-                                if item['level'] == 0:
-                                    item['description'] = "Collect eggs by touching"
-                                else:
-                                    item['description'] = f"Pickup range: {item['level']} grid"
-                            elif item_id == "golden_egg_chance":
-                                item['description'] = f"Golden Egg chance: {5 * item['level']}%"
-                            self.game.upgrades[item_id] = item['level']
+                            self.game.change_eggs(-item['cost'], "shop")
+                            self.set_level(item_id, item['level'] + 1)
+                            self.purchased()
                     elif self.tabs[self.current_tab] == "skins":
-                        self.game.eggs -= item['cost']
+                        self.game.change_eggs(-item['cost'], "shop")
                         self.game.snake_skin = item_id
+                        self.game.owned_skins.add(item_id)
+                        self.purchased()
                 return
 
         if self.buttons["back"].handle_event(pygame.event.Event(pygame.MOUSEBUTTONDOWN, {'pos': pos})):
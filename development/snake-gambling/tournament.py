@@ -0,0 +1,200 @@
+import argparse
+import importlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from core.simulation import UP, DOWN, LEFT, RIGHT, CELL, DEFAULT_UPGRADES
+from core.grid import SNAKE, SPIKES, BLOCK
+from core.autopilot import Autopilot
+from headless import play, wander_policy
+
+def is_safe(sim, direction):
+    x = sim.snake[0][0] + direction[0]
+    y = sim.snake[0][1] + direction[1]
+    return (CELL <= x < sim.width - CELL and CELL <= y < sim.height - CELL and
+            not sim.grid.has((x, y), SNAKE | SPIKES | BLOCK))
+
+
+def straight_policy(sim):
+    return None
+
+
+def greedy_policy(sim):
+    # head for the closest egg through safe cells, wander when nothing is safe and closer
+    if not sim.egg_positions:
+        return wander_policy(sim)
+    hx, hy = sim.snake[0]
+    tx, ty = min(sim.egg_positions, key=lambda egg: abs(egg[0] - hx) + abs(egg[1] - hy))
+    best = None
+    best_distance = abs(tx - hx) + abs(ty - hy)
+    for direction in (UP, DOWN, LEFT, RIGHT):
+        if direction[0] == -sim.direction[0] and direction[1] == -sim.direction[1]:
+            continue
+        distance = abs(tx - hx - direction[0]) + abs(ty - hy - direction[1])
+        if distance < best_distance and is_safe(sim, direction):
+            best, best_distance = direction, distance
+    if best is None:
+        return wander_policy(sim)
+    return None if best == sim.direction else best
+
+
+STRATEGIES = {
+    "straight": straight_policy,
+    "wander": wander_policy,
+    "greedy": greedy_policy,
+    # classes get a fresh instance per shard, so their stats cover that shard's games only
+    "autopilot": Autopilot
+}
+
+
+def load_strategy(name):
+    # a registered name, or module:function for strategies that live elsewhere
+    if name in STRATEGIES:
+        strategy = STRATEGIES[name]
+        return strategy() if isinstance(strategy, type) else strategy
+    module, _, function = name.partition(":")
+    if not function:
+        raise ValueError(f"unknown strategy {name!r}, expected one of {sorted(STRATEGIES)} or module:function")
+    return getattr(importlib.import_module(module), function)
+
+
+def play_shard(strategy, seeds, max_ticks, upgrades):
+    # runs in a worker process, strategies travel by name so they don't need to pickle
+    policy = load_strategy(strategy)
+    results = []
+    for seed in seeds:
+        result = play(seed, policy, max_ticks, upgrades)
+        result["strategy"] = strategy
+        results.append(result)
+    stats = policy.stats() if hasattr(policy, "stats") else None
+    return results, stats
+
+
+def shard_seeds(seed, games, shard_size):
+    return [range(start, min(start + shard_size, seed + games)) for start in range(seed, seed + games, shard_size)]
+
+
+def summarize(results, percentiles=(50, 90, 99)):
+    report = {"games": len(results)}
+    for key in ("score", "length", "ticks"):
+        values = np.array([result[key] for result in results])
+        report[key] = {"mean": float(values.mean()), "max": int(values.max())}
+        report[key].update({f"p{p}": float(np.percentile(values, p)) for p in percentiles})
+    causes = {}
+    for result in results:
+        causes[result["death_cause"]] = causes.get(result["death_cause"], 0) + 1
+    report["death_causes"] = {str(cause): count / len(results) for cause, count in sorted(causes.items(), key=lambda c: -c[1])}
+    return report
+
+
+def merge_stats(shard_stats):
+    # each shard's timings cover its last window of decisions: mean is weighted by decisions, p99 and max are the worst shard's
+    shard_stats = [stats for stats in shard_stats if stats]
+    if not shard_stats:
+        return None
+    decisions = sum(stats["decisions"] for stats in shard_stats)
+    return {
+        "decisions": decisions,
+        "fallbacks": sum(stats["fallbacks"] for stats in shard_stats),
+        "rebuilds": sum(stats["rebuilds"] for stats in shard_stats),
+        "mean_ms": sum(stats["mean_ms"] * stats["decisions"] for stats in shard_stats) / decisions,
+        "p99_ms": max(stats["p99_ms"] for stats in shard_stats),
+        "max_ms": max(stats["max_ms"] for stats in shard_stats)
+    }
+
+
+def print_report(reports, results, top):
+    print()
+    print(f"{'strategy':<12}{'games':>7}{'mean':>9}{'p50':>8}{'p90':>8}{'p99':>8}{'max':>7}{'ticks p50':>11}  deaths")
+    for strategy, report in sorted(reports.items(), key=lambda r: -r[1]["score"]["mean"]):
+        score = report["score"]
+        deaths = ", ".join(f"{cause} {share:.0%}" for cause, share in report["death_causes"].items())
+        print(f"{strategy:<12}{report['games']:>7}{score['mean']:>9.2f}{score['p50']:>8.1f}{score['p90']:>8.1f}"
+              f"{score['p99']:>8.1f}{score['max']:>7}{report['ticks']['p50']:>11.0f}  {deaths}")
+    for strategy, report in reports.items():
+        stats = report.get("decisions")
+        if stats:
+            print(f"{strategy}: {stats['decisions']:,} decisions, {stats['fallbacks']:,} fallbacks, "
+                  f"{stats['rebuilds']:,} rebuilds, {stats['mean_ms']:.2f}ms mean, "
+                  f"{stats['p99_ms']:.2f}ms p99, {stats['max_ms']:.2f}ms max")
+    print()
+    print(f"Top {top} games:")
+    leaders = sorted(results, key=lambda r: (-r["score"], -r["length"], r["ticks"]))[:top]
+    for rank, result in enumerate(leaders, 1):
+        print(f"{rank:>3}. {result['strategy']:<12} seed {result['seed']:<8} score {result['score']:<5} "
+              f"length {result['length']:<5} ticks {result['ticks']:<6} {result['death_cause']}")
+
+
+def parse_upgrades(values):
+    upgrades = dict(DEFAULT_UPGRADES)
+    for value in values:
+        name, _, level = value.partition("=")
+        if name not in upgrades or not level:
+            raise ValueError(f"bad upgrade {value!r}, expected one of {sorted(upgrades)} as name=level")
+        upgrades[name] = int(level)
+    return upgrades
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless snake tournament over a process pool")
+    parser.add_argument("strategies", nargs="*", default=["wander", "greedy"],
+                        help=f"registered strategies {sorted(STRATEGIES)} or module:function")
+    parser.add_argument("-n", "--games", type=int, default=1000, help="games per strategy")
+    parser.add_argument("--seed", type=int, default=0, help="first seed, every strategy plays the same seeds")
+    parser.add_argument("--max-ticks", type=int, default=10000)
+    parser.add_argument("--upgrade", action="append", default=[], metavar="NAME=LEVEL")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--shard-size", type=int, default=25)
+    parser.add_argument("--out", help="stream every game result to this file as JSON lines")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    try:
+        upgrades = parse_upgrades(args.upgrade)
+        for strategy in args.strategies:
+            load_strategy(strategy)
+    except (ValueError, ImportError, AttributeError) as e:
+        parser.error(str(e))
+
+    shards = [(strategy, seeds) for strategy in args.strategies
+              for seeds in shard_seeds(args.seed, args.games, args.shard_size)]
+    total = len(args.strategies) * args.games
+    results = []
+    shard_stats = {strategy: [] for strategy in args.strategies}
+    out = open(args.out, 'w') if args.out else None
+    start = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            futures = [pool.submit(play_shard, strategy, list(seeds), args.max_ticks, upgrades)
+                       for strategy, seeds in shards]
+            for future in as_completed(futures):
+                shard, stats = future.result()
+                results.extend(shard)
+                if shard:
+                    shard_stats[shard[0]["strategy"]].append(stats)
+                if out:
+                    for result in shard:
+                        out.write(json.dumps(result) + "\n")
+                    out.flush()
+                elapsed = time.perf_counter() - start
+                print(f"\r{len(results)}/{total} games, {len(results) / elapsed:,.0f} games/s", end="", file=sys.stderr)
+    finally:
+        if out:
+            out.close()
+    print(file=sys.stderr)
+
+    reports = {strategy: summarize([r for r in results if r["strategy"] == strategy]) for strategy in args.strategies}
+    for strategy, report in reports.items():
+        stats = merge_stats(shard_stats[strategy])
+        if stats:
+            report["decisions"] = stats
+    print(f"{total} games over {args.workers} workers in {time.perf_counter() - start:.2f}s, upgrades {upgrades}")
+    print_report(reports, results, args.top)
+    return reports
+
+
+if __name__ == "__main__":
+    main()